@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of the glob stripping done by the formatters.
+
+Compares the precompiled ``formatters.PatternMatcher`` against the original
+per-call ``re.sub`` implementation, checking both give the same output::
+
+    python -m benchmarks.bench_formatters
+"""
+from __future__ import print_function, unicode_literals
+
+import re
+import timeit
+
+from pytest_pspec import formatters
+
+PATTERNS = {
+    'files': ['test_*.py', '*_test.py'],
+    'functions': ['test*'],
+    'classes': ['Test*'],
+}
+
+STATEMENTS = {
+    'files': [
+        'tests/test_module.py',
+        'tests/sub/module_test.py',
+        'tests/test_a_very_long_module_name_for_a_service.py',
+    ],
+    'functions': [
+        'test_a_feature_is_working',
+        'should_work_without_prefix',
+        'Checking if {test_input} = {expected}...',
+    ],
+    'classes': [
+        'TestSimpleHTTPServer',
+        'AThingBuilderTest',
+        'TestProtobufGeneratedMessageRoundTrip',
+    ],
+}
+
+
+def legacy_remove_patterns(statement, patterns):
+    for glob_pattern in patterns:
+        pattern = glob_pattern.replace('*', '')
+
+        if glob_pattern.startswith('*'):
+            pattern = '{0}$'.format(pattern)
+            statement = re.sub(pattern, '', statement)
+
+        elif glob_pattern.endswith('*'):
+            pattern = '^{0}'.format(pattern)
+            statement = re.sub(pattern, '', statement)
+
+        elif '*' in glob_pattern:
+            infix_patterns = glob_pattern.split('*', 2)
+            infix_patterns[0] = '{}*'.format(infix_patterns[0])
+            infix_patterns[1] = '*{}'.format(infix_patterns[1])
+            statement = legacy_remove_patterns(statement, infix_patterns)
+
+        else:
+            pattern = '^{0}'.format(pattern)
+            statement = re.sub(pattern, '', statement)
+
+    return statement
+
+
+def main(number=20000):
+    for kind, patterns in sorted(PATTERNS.items()):
+        matcher = formatters.PatternMatcher(patterns)
+        statements = STATEMENTS[kind]
+
+        for statement in statements:
+            assert matcher.remove(statement) == (
+                legacy_remove_patterns(statement, patterns)
+            ), statement
+
+        legacy = timeit.timeit(
+            lambda: [legacy_remove_patterns(s, patterns) for s in statements],
+            number=number
+        )
+        compiled = timeit.timeit(
+            lambda: [matcher.remove(s) for s in statements],
+            number=number
+        )
+        print('{:<10} legacy {:.3f}s  compiled {:.3f}s  ({:.1f}x)'.format(
+            kind, legacy, compiled, legacy / compiled
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of formatting a large test inventory, comparing one
+``models.Node.parse`` call per nodeid with a single ``models.parse_many``::
+
+    python -m benchmarks.bench_parse_many
+"""
+from __future__ import print_function, unicode_literals
+
+import timeit
+
+from pytest_pspec import formatters, models
+
+PATTERN_CONFIG = models.PatternConfig(
+    files=formatters.PatternMatcher(['test_*.py']),
+    functions=formatters.PatternMatcher(['test*']),
+    classes=formatters.PatternMatcher(['Test*'])
+)
+
+
+def make_nodeids(count, modules=200, classes=10, functions=50):
+    nodeids = []
+    cases = max(count // (modules * classes * functions), 1)
+    for module in range(modules):
+        for klass in range(classes):
+            for function in range(functions):
+                for case in range(cases):
+                    nodeids.append(
+                        'tests/test_module_{}.py::TestThing{}::'
+                        'test_does_thing_{}[{}]'.format(
+                            module, klass, function, case
+                        )
+                    )
+    return nodeids[:count]
+
+
+def one_by_one(nodeids):
+    return [models.Node.parse(nodeid, PATTERN_CONFIG) for nodeid in nodeids]
+
+
+def batched(nodeids):
+    return models.parse_many(nodeids, PATTERN_CONFIG)
+
+
+def main(count=1000000):
+    nodeids = make_nodeids(count)
+
+    old = timeit.timeit(lambda: one_by_one(nodeids), number=1)
+    new = timeit.timeit(lambda: batched(nodeids), number=1)
+    print('{} nodeids: Node.parse {:.3f}s  parse_many {:.3f}s'.format(
+        len(nodeids), old, new
+    ), '({:.1f}x)'.format(old / new))
+
+
+if __name__ == '__main__':
+    main()
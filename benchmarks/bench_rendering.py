@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of building and rendering results, comparing the dict-based
+models with the wrapper chain against the ``__slots__`` models with the
+table-driven ``wrappers.Renderer``::
+
+    python -m benchmarks.bench_rendering
+"""
+from __future__ import print_function, unicode_literals
+
+import timeit
+import tracemalloc
+
+from pytest_pspec import wrappers
+from pytest_pspec.models import Node, Result
+
+OUTCOMES = ('passed', 'failed', 'skipped')
+
+
+class LegacyNode(object):
+
+    def __init__(self, title, class_name, module_name):
+        self.title = title
+        self.class_name = class_name
+        self.module_name = module_name
+
+    def __str__(self):
+        return self.title
+
+
+class LegacyResult(object):
+
+    def __init__(self, outcome, node):
+        self.outcome = outcome
+        self.node = node
+
+
+def legacy(count):
+    results = []
+    for index in range(count):
+        result = LegacyResult(
+            OUTCOMES[index % 3],
+            LegacyNode('a title', 'Class', 'module')
+        )
+        for wrapper in (wrappers.UTF8Wrapper, wrappers.ColorWrapper):
+            result = wrapper(result)
+        results.append((result, str(result)))
+    return results
+
+
+def current(count, render=wrappers.Renderer()):
+    results = []
+    for index in range(count):
+        result = Result(
+            OUTCOMES[index % 3],
+            Node('a title', 'Class', 'module')
+        )
+        results.append((result, render(result)))
+    return results
+
+
+def traced_memory(function, count):
+    """
+    Memory still held by the ``count`` results and their lines.
+    """
+    tracemalloc.start()
+    try:
+        results = function(count)
+        return tracemalloc.get_traced_memory()[0], len(results)
+    finally:
+        tracemalloc.stop()
+
+
+def main(count=100000):
+    assert [line for _, line in legacy(30)] == (
+        [line for _, line in current(30)]
+    )
+
+    for name, function in (('legacy', legacy), ('current', current)):
+        seconds = timeit.timeit(lambda: function(count), number=3) / 3
+        size, _ = traced_memory(function, count)
+        print('{:<8} {:.2f}us/result  {:.0f} bytes/result'.format(
+            name,
+            seconds / count * 1e6,
+            size / float(count)
+        ))
+
+
+if __name__ == '__main__':
+    main()
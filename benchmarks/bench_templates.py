@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of building display names for a heavily parametrized function,
+comparing the original ``str.format`` + ``except`` fallback with
+``formatters.render_docstring``. Docstrings with placeholders come out
+even or a little ahead, as ``format_map`` doesn't copy the parameters;
+docstrings without any skip ``str.format`` altogether::
+
+    python -m benchmarks.bench_templates
+"""
+from __future__ import print_function, unicode_literals
+
+import timeit
+
+from pytest_pspec import formatters
+from pytest_pspec.reporter import _format_parametrized_test_name
+
+DOCSTRINGS = (
+    ('no placeholders', 'computes the checksum'),
+    ('fitting docstring', 'computes {value} with {other!r}'),
+    ('missing field', 'computes {value} with {missing}'),
+    ('malformed', 'computes {value'),
+)
+
+
+class _CallSpec(object):
+
+    def __init__(self, params):
+        self.params = params
+
+
+def legacy(docstring, callspecs):
+    for callspec in callspecs:
+        try:
+            docstring.format(**callspec.params)
+        except (KeyError, ValueError):
+            _format_parametrized_test_name('test_computes', callspec)
+
+
+def current(docstring, callspecs):
+    for callspec in callspecs:
+        if formatters.render_docstring(docstring, callspec.params) is None:
+            _format_parametrized_test_name('test_computes', callspec)
+
+
+def main(count=50000):
+    callspecs = [
+        _CallSpec({'value': index, 'other': 'case-%d' % index})
+        for index in range(count)
+    ]
+
+    for name, docstring in DOCSTRINGS:
+        # The best of several runs, the others only measure machine noise
+        old = min(timeit.repeat(
+            lambda: legacy(docstring, callspecs), number=1, repeat=7
+        ))
+        new = min(timeit.repeat(
+            lambda: current(docstring, callspecs), number=1, repeat=7
+        ))
+        print('{:<18} legacy {:.3f}s  render {:.3f}s  ({:.1f}x)'.format(
+            name, old, new, old / new
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite for the pspec reporter hot path.
+
+Builds synthetic sessions mixing deep class nesting, long CamelCase names,
+heavy parametrization and docstring templates, then times each stage of the
+reporter separately and records its peak memory::
+
+    python -m benchmarks.suite --sizes 1000 10000 100000
+
+Every stage runs once untraced for the timing and once more under
+tracemalloc for the peak memory.
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import io
+import random
+import time
+import tracemalloc
+
+from _pytest.config import _prepareconfig
+from _pytest.reports import TestReport
+
+from pytest_pspec import models, reporter
+
+OUTCOMES = ('passed', 'passed', 'passed', 'passed', 'failed', 'skipped')
+
+WORDS = (
+    'Protobuf', 'Generated', 'Message', 'HTTP', 'Server', 'Round', 'Trip',
+    'Payment', 'Gateway', 'API', 'Client', 'Serializer', 'Checksum', 'Cache',
+)
+
+
+class _CallSpec(object):
+
+    def __init__(self, params):
+        self.params = params
+
+
+class _Class(object):
+
+    def __init__(self, obj):
+        self.obj = obj
+        self.name = obj.__name__
+
+
+class _Item(object):
+    """
+    The bits of a ``pytest.Function`` the plugin reads.
+    """
+
+    def __init__(self, config, nodeid, obj, parent_obj, callspec=None):
+        self.config = config
+        self.nodeid = nodeid
+        self.obj = obj
+        # Module level functions have no class to find
+        self._class = _Class(parent_obj) if isinstance(parent_obj, type) \
+            else None
+        if callspec is not None:
+            self.callspec = callspec
+
+    def getparent(self, cls):
+        return self._class
+
+
+def _camel_case(rng, words):
+    return ''.join(rng.choice(WORDS) for _ in range(words))
+
+
+def _make_function(name, doc):
+    def function():
+        pass
+
+    function.__name__ = name
+    function.__doc__ = doc
+    return function
+
+
+def make_session(config, count, seed=0):
+    """
+    Return ``count`` fake items spread over modules and (nested) classes.
+    """
+    rng = random.Random(seed)
+    items = []
+
+    while len(items) < count:
+        module = 'tests/{}/test_{}.py'.format(
+            rng.choice(('unit', 'integration', 'functional')),
+            '_'.join(rng.choice(WORDS).lower() for _ in range(3))
+        )
+        module_obj = _make_function(module, None)
+
+        for _ in range(rng.randint(1, 5)):
+            path = ['Test' + _camel_case(rng, rng.randint(2, 12))]
+            while rng.random() < 0.3:
+                path.append('Test' + _camel_case(rng, rng.randint(1, 4)))
+            klass = type(
+                str(path[-1]),
+                (object,),
+                {'__doc__': 'Describes ' + path[-1] if rng.random() < 0.3
+                 else None}
+            )
+            if rng.random() < 0.2:
+                path, klass = [], module_obj
+
+            for _ in range(rng.randint(1, 10)):
+                name = 'test_' + '_'.join(
+                    rng.choice(WORDS).lower() for _ in range(rng.randint(2, 6))
+                )
+                prefix = '::'.join([module] + path + [name])
+
+                if rng.random() < 0.5:
+                    doc = None
+                    if rng.random() < 0.5:
+                        doc = 'computes {value} with {other!r}'
+                    function = _make_function(name, doc)
+                    cases = rng.choice((2, 10, 100, 1000))
+                    for case in range(cases):
+                        params = {'value': case, 'other': 'case-%d' % case}
+                        items.append(_Item(
+                            config,
+                            '{}[{}]'.format(prefix, case),
+                            function,
+                            klass,
+                            _CallSpec(params)
+                        ))
+                else:
+                    doc = 'it ' + name[5:].replace('_', ' ') \
+                        if rng.random() < 0.3 else None
+                    items.append(_Item(
+                        config,
+                        prefix,
+                        _make_function(name, doc),
+                        klass
+                    ))
+
+    return items[:count]
+
+
+def make_reports(items, seed=0):
+    rng = random.Random(seed)
+    reports = []
+
+    for item in items:
+        outcome = rng.choice(OUTCOMES)
+        location = (item.nodeid.split('::')[0], 0, item.obj.__name__)
+
+        if outcome == 'skipped':
+            phases = (('setup', 'skipped'), ('teardown', 'passed'))
+        else:
+            phases = (
+                ('setup', 'passed'),
+                ('call', outcome),
+                ('teardown', 'passed'),
+            )
+
+        for when, phase_outcome in phases:
+            report = TestReport(
+                nodeid=item.nodeid,
+                location=location,
+                keywords={},
+                outcome=phase_outcome,
+                longrepr=None if phase_outcome != 'skipped'
+                else (location[0], 0, 'Skipped: synthetic'),
+                when=when,
+                duration=rng.random() / 100
+            )
+            if when == 'call' or phase_outcome == 'skipped':
+                report.pspec_nodeid = reporter._display_nodeid(item)
+            reports.append(report)
+
+    return reports
+
+
+def make_config(*args):
+    config = _prepareconfig(
+        ['--pspec', '-p', 'pytest_pspec.plugin'] + list(args)
+    )
+    config._do_configure()
+    return config
+
+
+def make_reporter(config):
+    return reporter.PspecTerminalReporter(config, file=io.StringIO())
+
+
+def stages(config, items):
+    reports = make_reports(items)
+    displayed = [
+        report for report in reports
+        if report.when == 'call' or report.skipped
+    ]
+    nodeids = [report.pspec_nodeid for report in displayed]
+    pspec_reporter = make_reporter(config)
+    pattern_config = pspec_reporter.pattern_config
+    results = [
+        models.Result.create(report, pattern_config) for report in displayed
+    ]
+
+    def display_names():
+        for item in items:
+            reporter._display_nodeid(item)
+
+    def node_parse():
+        for nodeid in nodeids:
+            models.Node.parse(nodeid, pattern_config)
+
+    def node_parse_cached():
+        cache = models.NodeCache()
+        for nodeid in nodeids:
+            models.Node.parse(nodeid, pattern_config, cache)
+
+    def result_create():
+        for report in displayed:
+            models.Result.create(report, pattern_config)
+
+    def render():
+        for result in results:
+            pspec_reporter.render(result)
+
+    def logreport():
+        logreport_reporter = make_reporter(config)
+        for report in reports:
+            logreport_reporter.pytest_runtest_logreport(report)
+
+    return (
+        ('display names', display_names),
+        ('Node.parse', node_parse),
+        ('Node.parse cached', node_parse_cached),
+        ('Result.create', result_create),
+        ('render', render),
+        ('logreport', logreport),
+    )
+
+
+def measure(function):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+        help='number of items of each synthetic session'
+    )
+    options = parser.parse_args(argv)
+
+    print('{:>8}  {:<18} {:>10} {:>12} {:>11}'.format(
+        'items', 'stage', 'total (s)', 'per item (us)', 'peak (KiB)'
+    ))
+    config = make_config()
+    try:
+        for size in options.sizes:
+            items = make_session(config, size)
+            for name, function in stages(config, items):
+                elapsed, peak = measure(function)
+                print('{:>8}  {:<18} {:>10.3f} {:>12.2f} {:>11.0f}'.format(
+                    size, name, elapsed, elapsed / size * 1e6, peak / 1024.0
+                ))
+    finally:
+        config._ensure_unconfigure()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import heapq
+import itertools
+
+
+class Durations(object):
+    """
+    The ``size`` slowest specs of a session, plus the total time per header.
+
+    Specs are kept in a min-heap of at most ``size`` entries, so a new one
+    only gets in by pushing out the fastest of them. Headers are summed per
+    (module, class) pair, which grows with the number of classes and modules
+    but not with the number of tests.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._specs = []
+        self._headers = {}
+        # Breaks ties between equal durations without comparing nodes
+        self._sequence = itertools.count()
+
+    def add(self, node, duration):
+        entry = (duration, next(self._sequence), node)
+        if len(self._specs) < self.size:
+            heapq.heappush(self._specs, entry)
+        elif duration > self._specs[0][0]:
+            heapq.heapreplace(self._specs, entry)
+
+        key = (node.module_name, node.class_name)
+        totals = self._headers.get(key)
+        if totals is None:
+            self._headers[key] = [duration, 1]
+        else:
+            totals[0] += duration
+            totals[1] += 1
+
+    def slowest_specs(self):
+        return [
+            (duration, node)
+            for duration, _, node in heapq.nlargest(self.size, self._specs)
+        ]
+
+    def slowest_headers(self):
+        return [
+            (total, count, module_name, class_name)
+            for (module_name, class_name), (total, count) in heapq.nlargest(
+                self.size,
+                self._headers.items(),
+                key=lambda item: item[1][0]
+            )
+        ]
+
+    def summary_lines(self):
+        for duration, node in self.slowest_specs():
+            yield '{:8.2f}s  {}: {}'.format(
+                duration,
+                node.class_name or node.module_name,
+                node.title
+            )
+
+    def header_summary_lines(self):
+        for total, count, module_name, class_name in self.slowest_headers():
+            specs = '{} spec{}'.format(count, '' if count == 1 else 's')
+            if class_name:
+                name = '{} ({}, {})'.format(class_name, module_name, specs)
+            else:
+                name = '{} ({})'.format(module_name, specs)
+            yield '{:8.2f}s  {}'.format(total, name)
@@ -1,7 +1,91 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import functools
 import re
+import reprlib
+
+
+class PatternMatcher(object):
+    """
+    The ``python_files``/``python_functions``/``python_classes`` globs
+    compiled once into a flat sequence of anchored strip steps.
+
+    Globs are applied in order, each one to the output of the previous one,
+    exactly like the original implementation did.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns)
+        self._steps = tuple(_compile_steps(self.patterns))
+
+    def __iter__(self):
+        return iter(self.patterns)
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, list(self.patterns))
+
+    def remove(self, statement):
+        for step in self._steps:
+            statement = step(statement)
+        return statement
+
+
+def compile_patterns(patterns):
+    if isinstance(patterns, PatternMatcher):
+        return patterns
+    return _cached_matcher(tuple(patterns))
+
+
+def render_docstring(docstring, params, max_len=0):
+    """
+    A parametrized test docstring formatted with ``params``, or ``None`` when
+    it can't be. With a ``max_len``, large values are bounded the way
+    ``format_param_value`` bounds them.
+    """
+    # Most docstrings have no placeholders at all, nothing to format
+    if '{' not in docstring and '}' not in docstring:
+        return docstring
+
+    try:
+        if max_len:
+            params = _bound_params(params, max_len)
+        return docstring.format_map(params)
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        # Missing parameters, or lookups and format specs they don't have
+        return None
+
+
+def format_param_value(value, max_len=0):
+    """
+    Render a parametrize value for a test title in at most about ``max_len``
+    characters (0 means unbounded). Large strings are sliced before being
+    quoted, and big arrays, frames, byte payloads and containers are
+    summarized by their type and size, so their full repr is never built.
+    """
+    if isinstance(value, str):
+        if max_len and len(value) > max_len:
+            return "'{}...'".format(value[:max_len])
+        return "'{}'".format(value)
+
+    if max_len:
+        summary = _summarize(value, max_len)
+        if summary is not None:
+            return summary
+
+    text = str(value)
+    if max_len and len(text) > max_len:
+        return text[:max_len] + '...'
+    return text
+
+
+def has_default_repr(value):
+    """
+    Whether ``str(value)`` would only give the ``<Type object at 0x...>`` repr.
+    """
+    value_type = type(value)
+    return value_type.__str__ is object.__str__ and \
+        value_type.__repr__ is object.__repr__
 
 
 def format_title(title, patterns):
@@ -9,18 +93,21 @@ def format_title(title, patterns):
 
 
 def format_class_name(class_name, patterns):
-    formatted = ''
-
     class_name = _remove_patterns(class_name, patterns)
-    if ' ' not in class_name:
-        for index, letter in enumerate(class_name):
-            if letter.isupper() and \
-                    _has_lower_letter_besides(index, class_name):
-                formatted += ' '
+    if ' ' in class_name:
+        return class_name.strip()
 
-            formatted += letter
-    else:
-        formatted = class_name
+    # An uppercase letter starts a new word when a lowercase letter sits on
+    # either side of it, which keeps acronyms like HTTP together.
+    letters_before = ' ' + class_name[:-1]
+    letters_after = class_name[1:] + ' '
+    formatted = ''.join(
+        ' ' + letter
+        if letter.isupper() and (before.islower() or after.islower())
+        else letter
+        for before, letter, after
+        in zip(letters_before, class_name, letters_after)
+    )
 
     return formatted.strip()
 
@@ -30,32 +117,183 @@ def format_module_name(module_name, patterns):
 
 
 def _remove_patterns(statement, patterns):
+    return compile_patterns(patterns).remove(statement)
+
+
+def _summarize(value, max_len):
+    shape = getattr(value, 'shape', None)
+    if isinstance(shape, tuple):
+        # Every element takes at least two characters once printed
+        if getattr(value, 'size', max_len) * 2 <= max_len:
+            return None
+
+        name = type(value).__name__
+        dtype = getattr(value, 'dtype', None)
+        if dtype is None:
+            return '{}(shape={})'.format(name, shape)
+        return '{}(shape={}, dtype={})'.format(
+            'array' if name == 'ndarray' else name,
+            shape,
+            dtype
+        )
+
+    if isinstance(value, _CONTAINERS):
+        # Also small ones, their items may be huge
+        text = _bounded_container_repr(value, max_len)
+        if len(text) > max_len:
+            return text[:max_len] + '...'
+        if '...' in text:
+            return text
+        return None
+
+    try:
+        length = len(value)
+    except TypeError:
+        return None
+
+    if length <= max_len:
+        return None
+    return '{}(len={})'.format(type(value).__name__, length)
+
+
+_CONTAINERS = (list, tuple, dict, set, frozenset)
+
+
+def _bounded_container_repr(value, max_len):
+    bounded = _bounded_repr(max_len)
+    value_type = type(value)
+    if value_type in _CONTAINERS:
+        return bounded.repr(value)
+
+    # reprlib only knows the builtin types by name and would build the full
+    # repr of subclasses, e.g. OrderedDict or namedtuples
+    level = bounded.maxlevel - 1
+    fields = getattr(value, '_fields', None)
+    if isinstance(value, tuple) and fields is not None:
+        items = [
+            '{}={}'.format(field, bounded.repr1(item, level))
+            for field, item in zip(fields[:bounded.maxtuple], value)
+        ]
+        if len(value) > bounded.maxtuple:
+            items.append('...')
+        return '{}({})'.format(value_type.__name__, ', '.join(items))
+
+    base = next(base for base in _CONTAINERS if isinstance(value, base))
+    return '{}({})'.format(
+        value_type.__name__,
+        getattr(bounded, 'repr_' + base.__name__)(value, bounded.maxlevel)
+    )
+
+
+class _BoundedParam(object):
+    """
+    Stands in for a large parametrize value in a docstring template.
+    """
+
+    __slots__ = ('text',)
+
+    def __init__(self, text):
+        self.text = text
+
+    def __str__(self):
+        return self.text
+
+    __repr__ = __str__
+
+    def __format__(self, format_spec):
+        return format(self.text, format_spec)
+
+
+def _bound_params(params, max_len):
+    bounded = None
+    for name, value in params.items():
+        if isinstance(value, str):
+            if len(value) <= max_len:
+                continue
+            value = value[:max_len] + '...'
+        elif value is None or isinstance(value, (int, float)):
+            continue
+        else:
+            summary = _summarize(value, max_len)
+            if summary is None:
+                continue
+            value = _BoundedParam(summary)
+
+        if bounded is None:
+            bounded = dict(params)
+        bounded[name] = value
+
+    return params if bounded is None else bounded
+
+
+@functools.lru_cache(maxsize=8)
+def _bounded_repr(max_len):
+    bounded = reprlib.Repr()
+    bounded.maxstring = bounded.maxother = max_len
+    bounded.maxlist = bounded.maxtuple = bounded.maxdict = \
+        bounded.maxset = bounded.maxfrozenset = max(max_len // 4, 1)
+    return bounded
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_matcher(patterns):
+    return PatternMatcher(patterns)
+
+
+def _compile_steps(patterns):
     for glob_pattern in patterns:
         pattern = glob_pattern.replace('*', '')
 
         if glob_pattern.startswith('*'):
-            pattern = '{0}$'.format(pattern)
-            statement = re.sub(pattern, '', statement)
+            step = _suffix_step(pattern)
 
-        elif glob_pattern.endswith('*'):
-            pattern = '^{0}'.format(pattern)
-            statement = re.sub(pattern, '', statement)
+        elif glob_pattern.endswith('*'):
+            step = _prefix_step(pattern)
 
         elif '*' in glob_pattern:
             infix_patterns = glob_pattern.split('*', 2)
             infix_patterns[0] = '{}*'.format(infix_patterns[0])
             infix_patterns[1] = '*{}'.format(infix_patterns[1])
-            statement = _remove_patterns(statement, infix_patterns)
+            yield from _compile_steps(infix_patterns)
+            continue
 
         else:
-            pattern = '^{0}'.format(pattern)
-            statement = re.sub(pattern, '', statement)
+            step = _prefix_step(pattern)
+
+        if step is not None:
+            yield step
+
+
+def _prefix_step(pattern):
+    if not pattern:
+        return None
+
+    if re.escape(pattern) != pattern:
+        return functools.partial(re.compile('^' + pattern).sub, '')
+
+    def strip_prefix(statement):
+        if statement.startswith(pattern):
+            return statement[len(pattern):]
+        return statement
+
+    return strip_prefix
+
+
+def _suffix_step(pattern):
+    if not pattern:
+        return None
 
-    return statement
+    if re.escape(pattern) != pattern:
+        return functools.partial(re.compile(pattern + '$').sub, '')
 
+    # ``$`` also matches right before a trailing newline
+    with_newline = pattern + '\n'
 
-def _has_lower_letter_besides(index, string):
-    letter_before = string[index - 1] if index > 0 else ''
-    letter_after = string[index + 1] if index < len(string) - 1 else ''
+    def strip_suffix(statement):
+        if statement.endswith(pattern):
+            return statement[:-len(pattern)]
+        if statement.endswith(with_newline):
+            return statement[:-len(with_newline)] + '\n'
+        return statement
 
-    return letter_before.islower() or letter_after.islower()
+    return strip_suffix
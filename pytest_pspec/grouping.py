@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from collections import Counter, OrderedDict
+
+
+def block_key(nodeid):
+    """
+    The module/class path of a nodeid, i.e. what its pspec header is made of.
+    """
+    return nodeid.split('[', 1)[0].rsplit('::', 1)[0]
+
+
+class BlockBuffer(object):
+    """
+    Keeps the rendered lines of each pspec block (class or module) until all
+    of its tests have reported, so results arriving interleaved from
+    several xdist workers are printed as one contiguous block.
+
+    Only blocks still waiting on tests are held in memory.
+    """
+
+    def __init__(self):
+        self._remaining = None
+        self._blocks = OrderedDict()
+
+    @property
+    def collected(self):
+        return self._remaining is not None
+
+    def expect(self, nodeids):
+        """
+        Register the collected nodeids; the first collection wins, as every
+        worker collects the same items.
+        """
+        if self._remaining is None:
+            self._remaining = Counter(block_key(nodeid) for nodeid in nodeids)
+
+    def add(self, nodeid, header, line):
+        key = block_key(nodeid)
+        block = self._blocks.get(key)
+        if block is None:
+            block = self._blocks[key] = (header, [])
+
+        block[1].append(line)
+
+    def finish(self, nodeid):
+        """
+        Mark a test as done, returning its ``(header, lines)`` block once
+        every test in it is done, otherwise ``None``.
+        """
+        key = block_key(nodeid)
+        if self._remaining is None or key not in self._remaining:
+            return self._blocks.pop(key, None)
+
+        self._remaining[key] -= 1
+        if self._remaining[key] > 0:
+            return None
+
+        del self._remaining[key]
+        return self._blocks.pop(key, None)
+
+    def pop_all(self):
+        """
+        Return every block still pending, in the order they were started.
+        """
+        blocks = list(self._blocks.values())
+        self._blocks.clear()
+        return blocks
+
+
+def param_key(nodeid):
+    """
+    The function of a parametrized nodeid, ``None`` for any other nodeid.
+    """
+    key, bracket, _ = nodeid.partition('[')
+    return key if bracket else None
+
+
+class ParamGroup(object):
+    """
+    Outcome counters of the cases of one parametrized function, plus the
+    rendered lines of its failed cases.
+    """
+
+    __slots__ = (
+        'total', 'passed', 'failed', 'skipped', 'failures', 'nodeid', 'header'
+    )
+
+    def __init__(self):
+        self.total = 0
+        self.passed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.failures = []
+        self.nodeid = None
+        self.header = None
+
+    @property
+    def done(self):
+        return self.passed + self.failed + self.skipped
+
+    @property
+    def outcome(self):
+        if self.failed:
+            return 'failed'
+        if self.passed:
+            return 'passed'
+        return 'skipped'
+
+    def add(self, outcome, line=None):
+        if outcome == 'passed':
+            self.passed += 1
+        elif outcome == 'failed':
+            self.failed += 1
+            self.failures.append(line)
+        else:
+            self.skipped += 1
+        return self.done >= self.total
+
+
+class ParamGroups(object):
+    """
+    The parametrized functions of a session, counted from the collected
+    nodeids; each is dropped as soon as all of its cases have reported.
+    """
+
+    def __init__(self):
+        self._groups = None
+
+    def expect(self, nodeids):
+        if self._groups is not None:
+            return
+
+        self._groups = OrderedDict()
+        for nodeid in nodeids:
+            key = param_key(nodeid)
+            if key is not None:
+                group = self._groups.get(key)
+                if group is None:
+                    group = self._groups[key] = ParamGroup()
+                group.total += 1
+
+    def get(self, nodeid):
+        if self._groups is None:
+            return None
+        key = param_key(nodeid)
+        return None if key is None else self._groups.get(key)
+
+    def finish(self, nodeid):
+        self._groups.pop(param_key(nodeid), None)
+
+    def pop_started(self):
+        """
+        Return every group with results that has not finished, e.g. after
+        ``-x`` or an interrupt, in the order they were collected.
+        """
+        started = [
+            group for group in self._groups.values() if group.done
+        ] if self._groups is not None else []
+        self._groups = OrderedDict()
+        return started
+
+
+class Tally(object):
+    """
+    Outcome counts of one block, with its latest report to name it by.
+    """
+
+    __slots__ = ('passed', 'failed', 'skipped', 'report')
+
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.report = None
+
+    def __str__(self):
+        return ' {} passed, {} failed, {} skipped'.format(
+            self.passed,
+            self.failed,
+            self.skipped
+        )
+
+
+class BlockTally(object):
+    """
+    Counts the outcomes of each pspec block, handing its ``Tally`` back once
+    every collected test in it has reported. Like ``BlockBuffer``, only
+    blocks still waiting on tests are held in memory.
+    """
+
+    def __init__(self):
+        self._remaining = None
+        self._tallies = OrderedDict()
+
+    def expect(self, nodeids):
+        if self._remaining is None:
+            self._remaining = Counter(block_key(nodeid) for nodeid in nodeids)
+
+    def add(self, report, outcome):
+        key = block_key(report.nodeid)
+        tally = self._tallies.get(key)
+        if tally is None:
+            tally = self._tallies[key] = Tally()
+
+        if outcome == 'passed':
+            tally.passed += 1
+        elif outcome == 'failed':
+            tally.failed += 1
+        else:
+            tally.skipped += 1
+        tally.report = report
+
+        if self._remaining is None or key not in self._remaining:
+            return None
+
+        self._remaining[key] -= 1
+        if self._remaining[key] > 0:
+            return None
+
+        del self._remaining[key]
+        return self._tallies.pop(key)
+
+    def pop_all(self):
+        """
+        Return every tally still pending, in the order they were started.
+        """
+        tallies = list(self._tallies.values())
+        self._tallies.clear()
+        return tallies
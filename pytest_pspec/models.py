@@ -1,18 +1,18 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
-from collections import namedtuple
-
-import six
+from array import array
+from collections import OrderedDict, namedtuple
 
 from . import formatters
 
 PatternConfig = namedtuple('PatternConfig', 'files functions classes')
 
 
-@six.python_2_unicode_compatible
 class Node(object):
 
+    __slots__ = ('title', 'class_name', 'module_name')
+
     def __init__(self, title, class_name, module_name):
         self.title = title
         self.class_name = class_name
@@ -30,27 +30,181 @@ class Node(object):
         )
 
     @classmethod
-    def parse(cls, nodeid, pattern_config):
-        node_parts = nodeid.split('::')
-        title = formatters.format_title(
-            node_parts[-1],
-            pattern_config.functions
-        )
-        module_name = formatters.format_module_name(
-            node_parts[0],
-            pattern_config.files
-        )
-        class_name = formatters.format_class_name(
-            node_parts[1],
-            pattern_config.classes
-        )
+    def parse(cls, nodeid, pattern_config, cache=None):
+        node_parts = _split_nodeid(nodeid)
+
+        if cache is None:
+            title = _format_title(node_parts[-1], pattern_config)
+            module_name, class_name = _format_header(
+                (node_parts[0], node_parts[1]),
+                pattern_config
+            )
+        else:
+            title = cache.get(
+                cache.titles,
+                node_parts[-1],
+                _format_title,
+                pattern_config
+            )
+            module_name, class_name = cache.get(
+                cache.headers,
+                (node_parts[0], node_parts[1]),
+                _format_header,
+                pattern_config
+            )
 
         return cls(title=title, class_name=class_name, module_name=module_name)
 
 
-@six.python_2_unicode_compatible
+def _split_nodeid(nodeid):
+    # Display ids come as their (module, class, title) parts already, as a
+    # title or class docstring may contain '::' itself
+    if isinstance(nodeid, tuple):
+        return nodeid
+    return nodeid.split('::')
+
+
+_MISSING = object()
+
+
+class NodeCache(object):
+    """
+    Bounded LRU memo of the formatted parts of parsed nodeids.
+
+    Headers (module and class) are kept apart from titles, so every
+    parametrized case of a class shares a single formatted header.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.headers = OrderedDict()
+        self.titles = OrderedDict()
+
+    def get(self, entries, key, compute, pattern_config):
+        # Most keys are new, so a miss must not cost an exception
+        value = entries.get(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            entries.move_to_end(key)
+            return value
+
+        self.misses += 1
+        value = compute(key, pattern_config)
+        if len(entries) >= self.maxsize:
+            entries.popitem(last=False)
+        entries[key] = value
+        return value
+
+
+class NodeTable(object):
+    """
+    Nodes returned by ``parse_many``, stored by column.
+
+    ``modules``, ``classes`` and ``titles`` hold, for each parsed nodeid, an
+    index into ``strings``, where every formatted name appears only once.
+    """
+
+    __slots__ = ('strings', 'modules', 'classes', 'titles')
+
+    def __init__(self):
+        self.strings = []
+        self.modules = array('L')
+        self.classes = array('L')
+        self.titles = array('L')
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __getitem__(self, index):
+        strings = self.strings
+        return Node(
+            title=strings[self.titles[index]],
+            class_name=strings[self.classes[index]],
+            module_name=strings[self.modules[index]]
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_columns(self):
+        return {
+            'strings': self.strings,
+            'modules': self.modules.tolist(),
+            'classes': self.classes.tolist(),
+            'titles': self.titles.tolist(),
+        }
+
+
+def parse_many(nodeids, pattern_config):
+    """
+    Parse ``nodeids``, or ``(module, class, title)`` tuples, like
+    ``Node.parse`` into a ``NodeTable``.
+
+    Every distinct module, class and title part is formatted once, however
+    many nodeids share it.
+    """
+    table = NodeTable()
+    strings = table.strings
+    interned = {}
+
+    def intern(value):
+        index = interned.get(value)
+        if index is None:
+            index = interned[value] = len(strings)
+            strings.append(value)
+        return index
+
+    modules = {}
+    classes = {}
+    titles = {}
+    add_module = table.modules.append
+    add_class = table.classes.append
+    add_title = table.titles.append
+
+    for nodeid in nodeids:
+        node_parts = _split_nodeid(nodeid)
+        module_part = node_parts[0]
+        class_part = node_parts[1]
+        title_part = node_parts[-1]
+
+        module_index = modules.get(module_part)
+        if module_index is None:
+            module_index = modules[module_part] = intern(
+                formatters.format_module_name(
+                    module_part,
+                    pattern_config.files
+                )
+            )
+
+        class_index = classes.get(class_part)
+        if class_index is None:
+            class_index = classes[class_part] = intern(
+                formatters.format_class_name(
+                    class_part,
+                    pattern_config.classes
+                )
+            )
+
+        title_index = titles.get(title_part)
+        if title_index is None:
+            title_index = titles[title_part] = intern(
+                _format_title(title_part, pattern_config)
+            )
+
+        add_module(module_index)
+        add_class(class_index)
+        add_title(title_index)
+
+    return table
+
+
 class Result(object):
 
+    __slots__ = ('outcome', 'node')
+
     _OUTCOME_REPRESENTATION = {
         'passed': '[x]',
         'failed': '[ ]',
@@ -82,11 +236,34 @@ class Result(object):
 
         return line
 
+    def to_record(self, report):
+        return {
+            'nodeid': report.nodeid,
+            'module': self.node.module_name,
+            'class': self.node.class_name,
+            'title': self.node.title,
+            'outcome': self.outcome,
+            'duration': report.duration,
+        }
+
     @property
     def header(self):
         return self.node.class_name or self.node.module_name
 
     @classmethod
-    def create(cls, report, pattern_config):
-        node = Node.parse(report.nodeid, pattern_config)
+    def create(cls, report, pattern_config, cache=None):
+        nodeid = getattr(report, 'pspec_nodeid', report.nodeid)
+        node = Node.parse(nodeid, pattern_config, cache)
         return cls(report.outcome, node)
+
+
+def _format_title(title, pattern_config):
+    return formatters.format_title(title, pattern_config.functions)
+
+
+def _format_header(header_parts, pattern_config):
+    module_part, class_part = header_parts
+    return (
+        formatters.format_module_name(module_part, pattern_config.files),
+        formatters.format_class_name(class_part, pattern_config.classes),
+    )
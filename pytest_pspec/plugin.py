@@ -2,9 +2,19 @@
 from __future__ import unicode_literals
 
 import pytest
-from _pytest.terminal import TerminalReporter
 
-from . import models, wrappers
+# Everything else lives in .reporter, imported only once --pspec is given so
+# sessions without it pay for nothing beyond these options
+_REPORTER_NAMES = frozenset((
+    'PspecTerminalReporter',
+    '_format_parametrized_test_name',
+))
+
+
+def _buffer_size(value):
+    if value == 'auto':
+        return value
+    return int(value)
 
 
 def pytest_addoption(parser):
@@ -13,147 +23,115 @@ def pytest_addoption(parser):
         '--pspec', action='store_true', dest='pspec', default=False,
         help='Report test progress in pspec format'
     )
+    group.addoption(
+        '--pspec-buffer', action='store', dest='pspec_buffer', default=None,
+        type=_buffer_size, metavar='N|auto',
+        help='Write pspec lines in chunks of N lines (auto: only when the '
+             'output is not a terminal)'
+    )
+    group.addoption(
+        '--pspec-async', action='store_true', dest='pspec_async',
+        default=False,
+        help='Write pspec output from a background thread, so a slow '
+             'stream does not hold up the tests'
+    )
+    group.addoption(
+        '--pspec-lean-stats', action='store_true', dest='pspec_lean_stats',
+        default=False,
+        help='Only count passed tests instead of keeping their reports '
+             '(-rP and -rp list no passed tests)'
+    )
+    group.addoption(
+        '--pspec-quiet', action='store_true', dest='pspec_quiet',
+        default=False,
+        help='Only print failed and skipped specs, and a passed/failed/'
+             'skipped tally per class/module (same as pspec_format=failures)'
+    )
+    group.addoption(
+        '--pspec-collapse-params', action='store_true',
+        dest='pspec_collapse_params', default=False,
+        help='Print one line per parametrized function with its passed '
+             'count, expanding only the failed cases'
+    )
+    group.addoption(
+        '--pspec-jsonl', action='store', dest='pspec_jsonl', default=None,
+        metavar='PATH',
+        help='Stream pspec results to PATH as JSON Lines'
+    )
+    group.addoption(
+        '--pspec-durations', action='store', dest='pspec_durations',
+        default=None, type=int, metavar='N',
+        help='Show the N slowest specs and class/module headers'
+    )
+    group.addoption(
+        '--pspec-progress', action='store_true', dest='pspec_progress',
+        default=False,
+        help='Keep a progress footer with throughput and ETA below the '
+             'pspec output (terminals only)'
+    )
+    group.addoption(
+        '--pspec-export', action='store', dest='pspec_export',
+        default=None, metavar='PATH',
+        help='Write the formatted names of the collected tests to PATH '
+             'as JSON columns'
+    )
+    group.addoption(
+        '--pspec-profile', action='store_true', dest='pspec_profile',
+        default=False,
+        help='Report the time spent in the pspec plugin itself'
+    )
+    group.addoption(
+        '--pspec-profile-dump', action='store', dest='pspec_profile_dump',
+        default=None, metavar='PATH',
+        help='Like --pspec-profile, also writing a pstats dump to PATH'
+    )
     parser.addini(
         'pspec_format',
-        help='pspec report format (plaintext|utf8)',
+        help='pspec report format (plaintext|utf8|failures)',
         default='utf8'
     )
+    parser.addini(
+        'pspec_param_max_len',
+        help='rough max length of each parametrize value in a test title '
+             '(0 for no limit)',
+        default='0'
+    )
+    parser.addini(
+        'pspec_cache_size',
+        help='max formatted headers/titles memoized per session '
+             '(0 disables the cache)',
+        default='1024'
+    )
+    parser.addini(
+        'pspec_title_cache',
+        help='keep formatted titles in the pytest cache between runs',
+        type='bool',
+        default=False
+    )
 
 
 @pytest.hookimpl(trylast=True)
 def pytest_configure(config):
     if config.option.pspec:
+        from . import reporter
+
+        config.pluginmanager.register(reporter, 'pspec-reporter')
+
         # Get the standard terminal reporter plugin and replace it with ours
         standard_reporter = config.pluginmanager.getplugin('terminalreporter')
-        pspec_reporter = PspecTerminalReporter(standard_reporter.config)
+        pspec_reporter = reporter.PspecTerminalReporter(
+            standard_reporter.config
+        )
         config.pluginmanager.unregister(standard_reporter)
         config.pluginmanager.register(pspec_reporter, 'terminalreporter')
 
 
-def _format_parametrized_test_name(function_name, callspec):
-    """
-    Format a parametrized test name to be more readable.
-    
-    Args:
-        function_name: The original function name (e.g., 'test_math')
-        callspec: The pytest callspec object containing parameters
-        
-    Returns:
-        A formatted string like 'math with test input=3 + 5, expected=8'
-    """
-    # Remove 'test_' prefix and replace underscores with spaces
-    clean_name = function_name.replace('test_', '').replace('_', ' ')
-    
-    # Format parameter values
-    if callspec and hasattr(callspec, 'params'):
-        param_strs = []
-        for key, value in callspec.params.items():
-            # Replace underscores with spaces in parameter names
-            clean_key = key.replace('_', ' ')
-            # Handle string values by adding quotes for clarity
-            if isinstance(value, str):
-                param_strs.append(f"{clean_key}='{value}'")
-            else:
-                param_strs.append(f"{clean_key}={value}")
-        
-        if param_strs:
-            return f"{clean_name} with {', '.join(param_strs)}"
-    
-    return clean_name
-
-
-def pytest_collection_modifyitems(config, items):
-    if not config.option.pspec:
-        return
-    
-    for item in items:
-        node = item.obj
-        parent = item.parent.obj
-        node_parts = item.nodeid.split('::')
-        
-        # Check if this is a parametrized test
-        if hasattr(item, "callspec") and item.callspec:
-            # If there's a docstring, try to format it with parameters
-            if node.__doc__:
-                try:
-                    node_str = node.__doc__.format(**item.callspec.params)
-                except (KeyError, ValueError):
-                    # If formatting fails, fall back to better parametrized format
-                    node_str = _format_parametrized_test_name(node.__name__, item.callspec)
-            else:
-                # No docstring, use the improved parametrized format
-                node_str = _format_parametrized_test_name(node.__name__, item.callspec)
-        else:
-            # Regular test (not parametrized)
-            node_str = node.__doc__ or node_parts[-1]
-
-        mode_str = node_parts[0]
-        klas_str = ''
-        node_parts_length = len(node_parts)
-
-        if node_parts_length > 3:
-            klas_str = parent.__doc__ or node_parts[-3]
-        elif node_parts_length > 2:
-            klas_str = parent.__doc__ or node_parts[-2]
-
-        item._nodeid = '::'.join([mode_str, klas_str, node_str])
-
-
-class PspecTerminalReporter(TerminalReporter):
-
-    def __init__(self, config, file=None):
-        TerminalReporter.__init__(self, config, file)
-        self._last_header = None
-        self.pattern_config = models.PatternConfig(
-            files=self.config.getini('python_files'),
-            functions=self.config.getini('python_functions'),
-            classes=self.config.getini('python_classes')
+def __getattr__(name):
+    if name not in _REPORTER_NAMES:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name)
         )
-        self.result_wrappers = []
-
-        if config.getini('pspec_format') != 'plaintext':
-            self.result_wrappers.append(wrappers.UTF8Wrapper)
-
-        if config.option.color != 'no':
-            self.result_wrappers.append(wrappers.ColorWrapper)
-
-    def _register_stats(self, report):
-        """
-        This method is not created for this plugin, but it is needed in order
-        to the reporter display the tests summary at the end.
-
-        Originally from:
-        https://github.com/pytest-dev/pytest/blob/47a2a77/_pytest/terminal.py#L198-L201
-        """
-        res = self.config.hook.pytest_report_teststatus(
-                report=report,
-                config=self.config)
-        category = res[0]
-        self.stats.setdefault(category, []).append(report)
-        self._tests_ran = True
-
-    def pytest_runtest_logreport(self, report):
-        self._register_stats(report)
-
-        if report.when != 'call' and not report.skipped:
-            return
-
-        # Update parent's progress tracking for correct percentage display
-        if hasattr(self, '_progress_nodeids_reported'):
-            self._progress_nodeids_reported.add(report.nodeid)
-
-        result = models.Result.create(report, self.pattern_config)
-
-        for wrapper in self.result_wrappers:
-            result = wrapper(result)
-
-        if result.header != self._last_header:
-            self._last_header = result.header
-            self._tw.sep(' ')
-            self._tw.line(result.header)
 
-        try:
-            self._tw.line(unicode(result))
-        except NameError:
-            self._tw.line(str(result))
+    from . import reporter
 
+    return getattr(reporter, name)
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import cProfile
+import functools
+import time
+from collections import OrderedDict
+
+from . import models
+
+_REPORTER_STAGES = (
+    ('_register_stats', 'stats registration'),
+    ('_create_result', 'model creation'),
+    ('render', 'rendering'),
+    ('_write_result', 'writing'),
+)
+_MODULE_STAGES = (
+    ('_format_title', 'formatters'),
+    ('_format_header', 'formatters'),
+)
+
+
+class Profiler(object):
+    """
+    Accumulates the time spent in each stage of the pspec plugin.
+
+    Stages are timed by swapping the reporter methods and module functions
+    for timed versions, so nothing is paid when profiling is off. With a
+    ``dump_path`` the same stages are also recorded by cProfile and written
+    as a pstats file on ``uninstall``.
+    """
+
+    def __init__(self, dump_path=None):
+        self.dump_path = dump_path
+        self.timings = OrderedDict()
+        self._cprofile = cProfile.Profile() if dump_path else None
+        self._depth = 0
+        self._patched = []
+
+    def install(self, terminal_reporter):
+        from . import reporter
+
+        self._patch(reporter, '_display_nodeid', 'display names')
+        for name, stage in _MODULE_STAGES:
+            self._patch(models, name, stage)
+        for name, stage in _REPORTER_STAGES:
+            method = getattr(terminal_reporter, name)
+            setattr(terminal_reporter, name, self.wrap(stage, method))
+
+    def uninstall(self, dump=True):
+        while self._patched:
+            owner, name, original = self._patched.pop()
+            setattr(owner, name, original)
+
+        if self._cprofile is not None and dump:
+            self._cprofile.dump_stats(self.dump_path)
+
+    def wrap(self, stage, function):
+        timing = self.timings.setdefault(stage, [0, 0.0])
+        cprofile = self._cprofile
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            self._depth += 1
+            if cprofile is not None and self._depth == 1:
+                cprofile.enable()
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timing[1] += time.perf_counter() - start
+                timing[0] += 1
+                if cprofile is not None and self._depth == 1:
+                    cprofile.disable()
+                self._depth -= 1
+
+        return timed
+
+    def summary_lines(self):
+        lines = ['{:<20} {:>9} {:>11} {:>13}'.format(
+            'pspec stage', 'calls', 'total (s)', 'per call (us)'
+        )]
+        for stage, (calls, seconds) in self.timings.items():
+            lines.append('{:<20} {:>9} {:>11.4f} {:>13.2f}'.format(
+                stage,
+                calls,
+                seconds,
+                seconds / calls * 1e6 if calls else 0.0
+            ))
+        if self.dump_path:
+            lines.append('pstats dump: {}'.format(self.dump_path))
+        return lines
+
+    def _patch(self, owner, name, stage):
+        original = getattr(owner, name)
+        self._patched.append((owner, name, original))
+        setattr(owner, name, self.wrap(stage, original))
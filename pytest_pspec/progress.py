@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import threading
+import time
+from collections import deque
+from operator import itemgetter
+
+
+class ProgressFooter(object):
+    """
+    Completed/total, throughput, ETA and the slowest running test, drawn on
+    a ``writers.FooterFile`` by a timer thread every ``interval`` seconds.
+
+    Tests themselves only update counters; the throughput is measured over
+    the last ``window`` seconds.
+    """
+
+    def __init__(self, file, width=80, interval=0.1, window=10.0):
+        self.file = file
+        self.width = width
+        self.interval = interval
+        self.total = None
+        self.completed = 0
+        self._running = {}
+        self._samples = deque(maxlen=max(2, int(window / interval)))
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self, nodeid):
+        self._running[nodeid] = time.monotonic()
+
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name='pspec-progress',
+                daemon=True
+            )
+            self._thread.start()
+
+    def finish(self, nodeid):
+        self._running.pop(nodeid, None)
+        self.completed += 1
+
+    def stop(self):
+        if self._thread is not None and not self._stopped.is_set():
+            self._stopped.set()
+            self._thread.join()
+            self.file.clear()
+
+    def line(self, now):
+        completed = self.completed
+        self._samples.append((now, completed))
+        then, done = self._samples[0]
+        rate = (completed - done) / (now - then) if now > then else 0.0
+
+        parts = [
+            '{}/{}'.format(completed, self.total or '?'),
+            '{:.1f} tests/s'.format(rate),
+        ]
+        if rate and self.total:
+            remaining = max(self.total - completed, 0)
+            parts.append('ETA {}'.format(_format_seconds(remaining / rate)))
+
+        # Copied in one go, the test loop keeps changing it meanwhile
+        running = dict(self._running)
+        if running:
+            nodeid, started = min(running.items(), key=itemgetter(1))
+            parts.append('slowest: {} ({})'.format(
+                nodeid,
+                _format_seconds(now - started)
+            ))
+
+        return ' | '.join(parts)[:self.width - 1]
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.file.draw(self.line(time.monotonic()))
+
+
+def _format_seconds(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return '{}:{:02d}:{:02d}'.format(hours, minutes, seconds)
+    return '{}:{:02d}'.format(minutes, seconds)
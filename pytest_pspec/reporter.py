@@ -0,0 +1,703 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import sys
+
+import pytest
+from _pytest.terminal import TerminalReporter
+
+from . import (
+    __version__,
+    durations,
+    formatters,
+    grouping,
+    models,
+    profiling,
+    progress,
+    stats,
+    storage,
+    tree,
+    wrappers,
+    writers
+)
+
+AUTO_BUFFER_SIZE = 1000
+ASYNC_QUEUE_SIZE = 10000
+
+title_store_key = pytest.StashKey()
+# Set when passed specs are only counted, so they need no display name
+count_passed_key = pytest.StashKey()
+
+# pytest's own pytest_report_teststatus implementations, which all put passed
+# setup and teardown reports in the '' category
+_BUILTIN_TESTSTATUS = frozenset((
+    '_pytest.runner',
+    '_pytest.skipping',
+    '_pytest.subtests',
+    '_pytest.terminal',
+))
+
+
+def pytest_terminal_summary(terminalreporter):
+    if isinstance(terminalreporter, PspecTerminalReporter):
+        terminalreporter.summary_pspec()
+
+
+def _is_xdist_controller(config):
+    return (
+        getattr(config.option, 'dist', 'no') != 'no' and
+        bool(getattr(config.option, 'tx', None)) and
+        not hasattr(config, 'workerinput')
+    )
+
+
+def _has_custom_teststatus(config):
+    return any(
+        getattr(impl.plugin, '__name__', None) not in _BUILTIN_TESTSTATUS
+        for impl in config.hook.pytest_report_teststatus.get_hookimpls()
+    )
+
+
+def _title_fingerprint(config):
+    # Everything besides the module source that formatted titles depend on
+    return [
+        __version__,
+        config.getini('python_files'),
+        config.getini('python_functions'),
+        config.getini('python_classes'),
+        config.getini('pspec_param_max_len'),
+    ]
+
+
+def _format_parametrized_test_name(function_name, callspec, max_len=0):
+    """
+    Format a parametrized test name to be more readable.
+    
+    Args:
+        function_name: The original function name (e.g., 'test_math')
+        callspec: The pytest callspec object containing parameters
+        max_len: Rough limit for each rendered value (0 for no limit)
+        
+    Returns:
+        A formatted string like 'math with test input=3 + 5, expected=8'
+    """
+    # Remove 'test_' prefix and replace underscores with spaces
+    clean_name = function_name.replace('test_', '').replace('_', ' ')
+    
+    # Format parameter values
+    if callspec and hasattr(callspec, 'params'):
+        case_id = getattr(callspec, 'id', None)
+        param_strs = []
+        for key, value in callspec.params.items():
+            # Objects without a readable str are better named by pytest's id
+            if case_id and formatters.has_default_repr(value):
+                return f"{clean_name} [{case_id}]"
+            # Replace underscores with spaces in parameter names
+            clean_key = key.replace('_', ' ')
+            # Strings get quotes for clarity, large values get summarized
+            value_str = formatters.format_param_value(value, max_len)
+            param_strs.append(f"{clean_key}={value_str}")
+        
+        if param_strs:
+            return f"{clean_name} with {', '.join(param_strs)}"
+    
+    return clean_name
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+    report = yield
+
+    # The display name rides along on the report, so the real nodeid is left
+    # untouched and names are only built for results that get printed
+    if report.passed and item.config.stash.get(count_passed_key, False):
+        return report
+
+    if isinstance(item, pytest.Function) and \
+            (report.when == 'call' or report.skipped or
+             report.when == 'setup' and report.failed):
+        # Titles stored by an earlier run need no display name at all
+        store = item.config.stash.get(title_store_key, None)
+        if store is None or report.nodeid not in store:
+            report.pspec_nodeid = _display_nodeid(item)
+
+    return report
+
+
+def _display_nodeid(item):
+    """
+    The ``(module, class, title)`` parts ``models.Node.parse`` formats.
+    """
+    node = item.obj
+    node_parts = item.nodeid.split('::')
+
+    # Check if this is a parametrized test
+    if hasattr(item, "callspec") and item.callspec:
+        node_str = None
+        max_len = int(item.config.getini('pspec_param_max_len'))
+        # If there's a docstring, try to format it with parameters
+        if node.__doc__:
+            node_str = formatters.render_docstring(
+                node.__doc__,
+                item.callspec.params,
+                max_len
+            )
+        if node_str is None:
+            # No usable docstring, use the improved parametrized format
+            node_str = _format_parametrized_test_name(
+                node.__name__,
+                item.callspec,
+                max_len
+            )
+    else:
+        # Regular test (not parametrized)
+        node_str = node.__doc__ or node_parts[-1]
+
+    mode_str = node_parts[0]
+    klas_str = ''
+    # The innermost class, also for nested ones and ids containing '::'
+    klas = item.getparent(pytest.Class)
+    if klas is not None:
+        klas_str = klas.obj.__doc__ or klas.name
+
+    return (mode_str, klas_str, node_str)
+
+
+class PspecTerminalReporter(TerminalReporter):
+
+    def __init__(self, config, file=None):
+        if file is None:
+            file = sys.stdout
+
+        # The footer is redrawn in place, which only makes sense on a terminal
+        use_footer = config.option.pspec_progress and file.isatty()
+
+        # Both write from their own thread, also while a test runs and
+        # pytest's capture has taken over the stdout fd
+        self._duplicate = None
+        if use_footer or config.option.pspec_async:
+            self._duplicate = writers.duplicate(file)
+            file = self._duplicate or file
+
+        self._footer = None
+        if use_footer:
+            file = writers.FooterFile(file)
+            self._footer = progress.ProgressFooter(file)
+
+        self._async = None
+        if config.option.pspec_async:
+            self._async = file = writers.AsyncFile(file, ASYNC_QUEUE_SIZE)
+
+        buffer_size = config.option.pspec_buffer
+        if buffer_size == 'auto':
+            buffer_size = None if file.isatty() else AUTO_BUFFER_SIZE
+        self._buffer = None
+        if buffer_size and buffer_size > 1:
+            self._buffer = file = writers.BufferedFile(file, buffer_size)
+
+        TerminalReporter.__init__(self, config, file)
+        if self._footer is not None:
+            self._footer.width = self._tw.fullwidth
+        self._last_header = None
+        self._last_node = None
+        # Built after collection, the xdist controller has none
+        self.spec_tree = None
+        self._fast_stats = not _has_custom_teststatus(config)
+
+        # Only counts of passed reports are kept, the rest as usual, plus
+        # the teardowns of failed tests for their captured output
+        self._lean_stats = config.option.pspec_lean_stats
+        self._failed_nodeids = set()
+        self._reported_count = 0
+        self.pattern_config = models.PatternConfig(
+            files=formatters.PatternMatcher(
+                self.config.getini('python_files')
+            ),
+            functions=formatters.PatternMatcher(
+                self.config.getini('python_functions')
+            ),
+            classes=formatters.PatternMatcher(
+                self.config.getini('python_classes')
+            )
+        )
+
+        cache_size = int(config.getini('pspec_cache_size'))
+        self.node_cache = models.NodeCache(cache_size) if cache_size else None
+
+        self.render = wrappers.Renderer(
+            utf8=config.getini('pspec_format') != 'plaintext',
+            color=config.option.color != 'no'
+        )
+
+        self.title_store = None
+        if config.getini('pspec_title_cache') and \
+                getattr(config, 'cache', None) is not None:
+            self.title_store = storage.TitleStore(
+                config.cache,
+                config.rootpath,
+                _title_fingerprint(config),
+                readonly=hasattr(config, 'workerinput')
+            )
+            config.stash[title_store_key] = self.title_store
+
+        self.durations = None
+        if (config.option.pspec_durations or 0) > 0:
+            self.durations = durations.Durations(config.option.pspec_durations)
+
+        # Under xdist only the controller writes the file, it gets every report
+        self._jsonl = None
+        if config.option.pspec_jsonl and not hasattr(config, 'workerinput'):
+            self._jsonl = writers.JsonLinesWriter(config.option.pspec_jsonl)
+
+        # Under xdist results from several workers arrive interleaved, so
+        # the controller holds each block until all of its tests are done
+        self._blocks = None
+        if _is_xdist_controller(config):
+            self._blocks = grouping.BlockBuffer()
+
+        # Only failed and skipped specs are printed, and a tally per block
+        self._tally = None
+        if config.option.pspec_quiet or \
+                config.getini('pspec_format') == 'failures':
+            self._tally = grouping.BlockTally()
+        self._per_spec_output = \
+            self.durations is not None or self._jsonl is not None
+        # xdist workers still name them, the controller needs their headers
+        config.stash[count_passed_key] = self._tally is not None and \
+            not self._per_spec_output and not hasattr(config, 'workerinput')
+
+        # Parametrized functions print one line with their counts
+        self._params = None
+        if config.option.pspec_collapse_params and self._tally is None:
+            self._params = grouping.ParamGroups()
+
+        self.profiler = None
+        if config.option.pspec_profile or config.option.pspec_profile_dump:
+            self.profiler = profiling.Profiler(
+                config.option.pspec_profile_dump
+            )
+            self.profiler.install(self)
+
+    def _register_stats(self, report):
+        """
+        This method is not created for this plugin, but it is needed in order
+        to the reporter display the tests summary at the end.
+
+        Originally from:
+        https://github.com/pytest-dev/pytest/blob/47a2a77/_pytest/terminal.py#L198-L201
+        """
+        if self._fast_stats and report.passed and report.when != 'call':
+            # What the builtin hooks would answer, without the dispatch
+            category = ''
+        else:
+            res = self.config.hook.pytest_report_teststatus(
+                    report=report,
+                    config=self.config)
+            category = res[0]
+        self._tests_ran = True
+
+        if self._lean_stats:
+            if category == 'passed':
+                passed = self.stats.get(category)
+                if passed is None:
+                    passed = self.stats[category] = stats.ReportCount()
+                passed.append(report)
+                return
+            if category in ('failed', 'error'):
+                if report.when != 'teardown':
+                    self._failed_nodeids.add(report.nodeid)
+            elif category == '':
+                if report.when != 'teardown' or \
+                        report.nodeid not in self._failed_nodeids:
+                    return
+                self._failed_nodeids.discard(report.nodeid)
+
+        self.stats.setdefault(category, []).append(report)
+
+    @property
+    def reported_progress(self):
+        if self._lean_stats:
+            return self._reported_count
+        return TerminalReporter.reported_progress.fget(self)
+
+    def _get_reports_to_display(self, key):
+        reports = self.stats.get(key)
+        if isinstance(reports, stats.ReportCount):
+            return reports
+        return TerminalReporter._get_reports_to_display(self, key)
+
+    def pytest_plugin_registered(self, plugin):
+        TerminalReporter.pytest_plugin_registered(self, plugin)
+
+        # conftest files below the rootdir are only loaded during collection
+        if self._fast_stats and \
+                callable(getattr(plugin, 'pytest_report_teststatus', None)):
+            self._fast_stats = not _has_custom_teststatus(self.config)
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        TerminalReporter.pytest_runtest_logstart(self, nodeid, location)
+        if self._footer is not None:
+            if self._footer.total is None:
+                self._footer.total = self._session.testscollected
+            self._footer.start(nodeid)
+
+    def pytest_runtest_logfinish(self, nodeid):
+        if self._footer is not None:
+            self._footer.finish(nodeid)
+
+    def pytest_runtest_logreport(self, report):
+        self._register_stats(report)
+
+        if report.when != 'call' and not report.skipped:
+            if self._blocks is not None and report.when == 'teardown':
+                self._write_block(self._blocks.finish(report.nodeid))
+            # A test failing in its setup still has to count for its block
+            if report.when == 'setup' and report.failed:
+                if self._tally is not None:
+                    self._count_result(report, 'failed')
+                elif self._params is not None:
+                    self._collapse_setup_error(report)
+            return
+
+        # Update parent's progress tracking for correct percentage display
+        if self._lean_stats:
+            self._reported_count += 1
+        elif hasattr(self, '_progress_nodeids_reported'):
+            self._progress_nodeids_reported.add(report.nodeid)
+
+        if self._tally is not None:
+            self._write_failures_only(report)
+            return
+
+        result = self._create_result(report)
+        if self._params is not None:
+            group = self._params.get(report.nodeid)
+            if group is not None:
+                self._collapse_result(report, result, group)
+                return
+
+        self._write_result(report.nodeid, result.header, self.render(result))
+
+    def _write_failures_only(self, report):
+        # Passed specs are only counted, unless a per-spec output needs them
+        if not report.passed or self._per_spec_output:
+            result = self._create_result(report)
+            if not report.passed:
+                self._write_result(
+                    report.nodeid,
+                    result.header,
+                    self.render(result)
+                )
+
+        self._count_result(report, report.outcome)
+
+    def _count_result(self, report, outcome):
+        tally = self._tally.add(report, outcome)
+        if tally is not None:
+            self._write_tally(tally)
+
+    def _write_tally(self, tally):
+        report = tally.report
+        node = None
+        if self.title_store is not None and \
+                not hasattr(report, 'pspec_nodeid'):
+            node = self.title_store.get(report.nodeid)
+        if node is None:
+            nodeid = getattr(report, 'pspec_nodeid', None)
+            if nodeid is None:
+                # Only a failed setup, named after its raw nodeid
+                node_parts = report.nodeid.split('[', 1)[0].split('::')
+                klas_str = node_parts[-2] if len(node_parts) > 2 else ''
+                nodeid = (node_parts[0], klas_str, node_parts[-1])
+            node = models.Node.parse(
+                nodeid,
+                self.pattern_config,
+                self.node_cache
+            )
+
+        self._write_result(
+            report.nodeid,
+            node.class_name or node.module_name,
+            str(tally)
+        )
+
+    def _write_pending_tallies(self):
+        if self._tally is not None:
+            for tally in self._tally.pop_all():
+                self._write_tally(tally)
+
+    def _create_result(self, report):
+        store = self.title_store
+        node = None
+        if store is not None and not hasattr(report, 'pspec_nodeid'):
+            node = store.get(report.nodeid)
+
+        if node is None:
+            result = models.Result.create(
+                report,
+                self.pattern_config,
+                self.node_cache
+            )
+            if store is not None:
+                store.put(report.nodeid, result.node)
+        else:
+            result = models.Result(report.outcome, node)
+
+        if self.durations is not None:
+            self.durations.add(result.node, report.duration)
+        if self._jsonl is not None:
+            self._jsonl.write(result.to_record(report))
+
+        return result
+
+    def _collapse_result(self, report, result, group):
+        if group.nodeid is None:
+            group.nodeid = report.nodeid
+            group.header = result.header
+
+        # Passed and skipped cases are only counted, never rendered
+        line = self.render(result) if result.outcome == 'failed' else None
+        if group.add(result.outcome, line):
+            self._params.finish(report.nodeid)
+            self._write_param_group(group)
+
+    def _collapse_setup_error(self, report):
+        group = self._params.get(report.nodeid)
+        if group is None:
+            return
+
+        node = None
+        if self.title_store is not None and \
+                not hasattr(report, 'pspec_nodeid'):
+            node = self.title_store.get(report.nodeid)
+        if node is None:
+            node = models.Node.parse(
+                getattr(report, 'pspec_nodeid', report.nodeid),
+                self.pattern_config,
+                self.node_cache
+            )
+        self._collapse_result(report, models.Result('failed', node), group)
+
+    def _write_param_group(self, group):
+        function_name = grouping.param_key(group.nodeid).rsplit('::', 1)[-1]
+        title = '{} ({}/{})'.format(
+            formatters.format_title(
+                function_name,
+                self.pattern_config.functions
+            ),
+            group.passed,
+            group.total
+        )
+        node = models.Node(title, class_name=None, module_name=None)
+        self._write_result(
+            group.nodeid,
+            group.header,
+            self.render(models.Result(group.outcome, node))
+        )
+        for line in group.failures:
+            self._write_result(group.nodeid, group.header, '  ' + line)
+
+    def _write_pending_params(self):
+        if self._params is not None:
+            for group in self._params.pop_started():
+                self._write_param_group(group)
+
+    def _write_result(self, nodeid, header, line):
+        if self._blocks is not None:
+            self._blocks.add(nodeid, header, line)
+            return
+
+        node = None
+        if self.spec_tree is not None:
+            node = self.spec_tree.header(nodeid)
+
+        if node is None:
+            self._write_header(header)
+            self._tw.line(line)
+        else:
+            self._write_tree_header(node)
+            self._tw.line(' ' * node.indent + line)
+
+    def pytest_collection_finish(self, session):
+        TerminalReporter.pytest_collection_finish(self, session)
+        self.spec_tree = tree.SpecTree.build(
+            session.items,
+            self.pattern_config
+        )
+        if self._params is not None:
+            self._params.expect(item.nodeid for item in session.items)
+        if self._tally is not None:
+            self._tally.expect(item.nodeid for item in session.items)
+        # Workers all collect the same items and the xdist controller none,
+        # so the first worker writes the export
+        workerinput = getattr(self.config, 'workerinput', None)
+        if self.config.option.pspec_export and \
+                (workerinput is None or workerinput['workerid'] == 'gw0'):
+            self._export(session.items)
+
+    def _export(self, items):
+        table = models.parse_many(
+            (
+                _display_nodeid(item)
+                if isinstance(item, pytest.Function) else item.nodeid
+                for item in items
+            ),
+            self.pattern_config
+        )
+        writers.export_nodes(
+            self.config.option.pspec_export,
+            (item.nodeid for item in items),
+            table
+        )
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_node_collection_finished(self, node, ids):
+        if self._blocks is not None:
+            self._blocks.expect(ids)
+        if self._params is not None:
+            self._params.expect(ids)
+        if self._tally is not None:
+            self._tally.expect(ids)
+
+    def _write_header(self, header):
+        if header != self._last_header:
+            self._last_header = header
+            self._last_node = None
+            self.flush_pspec()
+            self._tw.sep(' ')
+            self._tw.line(header)
+
+    def _write_tree_header(self, node):
+        if node is self._last_node:
+            return
+
+        path = node.path
+        previous = self._last_node.path if self._last_node is not None else []
+        common = 0
+        for new, old in zip(path, previous):
+            if new is not old:
+                break
+            common += 1
+
+        self._last_node = node
+        self._last_header = None
+        # Back in an enclosing class, its header is repeated on its own
+        common = min(common, len(path) - 1)
+
+        self.flush_pspec()
+        self._tw.sep(' ')
+        for block in path[common:]:
+            self._tw.line(' ' * block.indent + block.title)
+
+    def _write_block(self, block):
+        if block is None:
+            return
+
+        header, lines = block
+        self._write_header(header)
+        for line in lines:
+            self._tw.line(line)
+
+    def _write_pending_blocks(self):
+        if self._blocks is not None:
+            for block in self._blocks.pop_all():
+                self._write_block(block)
+
+    def _stop_footer(self):
+        if self._footer is not None:
+            self._drain_output()
+            self._footer.stop()
+
+    def _drain_output(self):
+        self.flush_pspec()
+        if self._async is not None:
+            self._async.drain()
+
+    def flush_pspec(self):
+        if self._buffer is not None:
+            self._buffer.drain()
+        if self._jsonl is not None:
+            self._jsonl.flush()
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_sessionfinish(self, session, exitstatus):
+        self._write_pending_params()
+        self._write_pending_tallies()
+        self._write_pending_blocks()
+        self._stop_footer()
+        try:
+            return (yield from TerminalReporter.pytest_sessionfinish(
+                self,
+                session,
+                exitstatus
+            ))
+        finally:
+            self._drain_output()
+            if self.title_store is not None:
+                self.title_store.save()
+
+    def pytest_unconfigure(self):
+        self._stop_footer()
+        TerminalReporter.pytest_unconfigure(self)
+        self._drain_output()
+        if self._async is not None:
+            self._async.close()
+        if self._duplicate is not None:
+            self._duplicate.close()
+        if self._jsonl is not None:
+            self._jsonl.close()
+        if self.profiler is not None:
+            # Workers would all overwrite the controller's dump
+            self.profiler.uninstall(
+                dump=not hasattr(self.config, 'workerinput')
+            )
+
+    def pytest_keyboard_interrupt(self, excinfo):
+        self._write_pending_params()
+        self._write_pending_tallies()
+        self._write_pending_blocks()
+        self._stop_footer()
+        self._drain_output()
+        TerminalReporter.pytest_keyboard_interrupt(self, excinfo)
+
+    def pytest_internalerror(self, excrepr):
+        self._drain_output()
+        return TerminalReporter.pytest_internalerror(self, excrepr)
+
+    def summary_pspec(self):
+        if self.durations is not None:
+            self._summary_durations()
+
+        caches = []
+        if self.verbosity > 0:
+            caches = [
+                (name, cache)
+                for name, cache in (
+                    ('node cache', self.node_cache),
+                    ('title cache', self.title_store),
+                )
+                if cache is not None
+            ]
+        if not caches and self.profiler is None:
+            return
+
+        self.write_sep('-', 'pspec')
+        for name, cache in caches:
+            self.write_line('{}: {} hits, {} misses'.format(
+                name,
+                cache.hits,
+                cache.misses
+            ))
+        if self.profiler is not None:
+            for line in self.profiler.summary_lines():
+                self.write_line(line)
+
+    def _summary_durations(self):
+        size = self.durations.size
+        self.write_sep('-', 'slowest {} specs'.format(size))
+        for line in self.durations.summary_lines():
+            self.write_line(line)
+
+        self.write_sep('-', 'slowest {} headers'.format(size))
+        for line in self.durations.header_summary_lines():
+            self.write_line(line)
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import argparse
+import importlib
+import json
+import os
+import select
+import shutil
+import signal
+import socket
+import sys
+import traceback
+
+DEFAULT_SOCKET = '.pspec.sock'
+SOCKET_ENV = 'PSPEC_SOCKET'
+# Inherited over a re-exec, so queued clients aren't dropped on a reload
+LISTEN_FD_ENV = 'PSPEC_LISTEN_FD'
+PENDING_FD_ENV = 'PSPEC_PENDING_FD'
+
+
+def main(argv=None):
+    """
+    ``pspec serve [MODULE ...]``, ``pspec run [PYTEST ARGS]``, or any other
+    arguments for a plain ``pytest --pspec``, as is ``pspec run`` when no
+    server is listening.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if argv[:1] == ['serve']:
+        return serve(argv[1:])
+    if argv[:1] == ['run']:
+        return run(argv[1:])
+    return _exec_pytest(argv)
+
+
+def serve(argv):
+    parser = argparse.ArgumentParser(
+        prog='pspec serve',
+        description='Keep pytest and MODULES imported, forking a warm '
+                    'process for each `pspec run`.'
+    )
+    parser.add_argument(
+        '--socket', default=os.environ.get(SOCKET_ENV, DEFAULT_SOCKET),
+        help='Unix socket to listen on (default: $PSPEC_SOCKET or '
+             '{})'.format(DEFAULT_SOCKET)
+    )
+    parser.add_argument(
+        'modules', nargs='*', metavar='MODULE',
+        help='modules to import up front, e.g. your application packages'
+    )
+    options = parser.parse_args(argv)
+
+    if not hasattr(os, 'fork') or not hasattr(socket, 'AF_UNIX'):
+        parser.error('needs fork() and Unix sockets')
+
+    server = ForkServer(options.socket, options.modules)
+    server.preload()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+def run(args, path=None):
+    if path is None:
+        path = os.environ.get(SOCKET_ENV, DEFAULT_SOCKET)
+
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(path)
+    except OSError:
+        conn.close()
+        return _exec_pytest(args)
+
+    env = dict(os.environ)
+    # The output goes through a socket, the child can't see our terminal
+    if sys.stdout.isatty():
+        if not any(arg.startswith('--color') for arg in args):
+            args = ['--color=yes'] + list(args)
+        env['COLUMNS'] = str(shutil.get_terminal_size().columns)
+
+    request = {'args': list(args), 'cwd': os.getcwd(), 'env': env}
+    with conn:
+        conn.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        return _stream_output(conn, sys.stdout.buffer)
+
+
+def _stream_output(conn, out):
+    """
+    Copy the output of a run to ``out``; its last byte is the exit code.
+    """
+    held = b''
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data = held + chunk
+        out.write(data[:-1])
+        out.flush()
+        held = data[-1:]
+
+    # The server went away before the run ended
+    if not held:
+        return 1
+    return held[0]
+
+
+def _exec_pytest(args):
+    os.execvp('pytest', ['pytest', '--pspec'] + list(args))
+
+
+class ModuleSnapshot(object):
+    """
+    ``[mtime_ns, size]`` of the file of every imported module, to tell when
+    the warm state of a server no longer matches the code on disk.
+    """
+
+    def __init__(self, modules=None):
+        if modules is None:
+            modules = sys.modules
+
+        self._stamps = {}
+        for module in list(modules.values()):
+            path = getattr(module, '__file__', None)
+            if path:
+                stamp = _stamp(path)
+                if stamp is not None:
+                    self._stamps[path] = stamp
+
+    def __len__(self):
+        return len(self._stamps)
+
+    def changed(self):
+        """
+        The path of a module file changed since the snapshot, or ``None``.
+        """
+        for path, stamp in self._stamps.items():
+            if _stamp(path) != stamp:
+                return path
+        return None
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class ForkServer(object):
+    """
+    Accepts one JSON request line per connection and forks a worker for it.
+    The worker forks the pytest run itself, with stdout and stderr on the
+    connection, and sends its exit code as the last byte once it is done.
+    """
+
+    def __init__(self, path, modules=()):
+        self.path = path
+        self.modules = list(modules)
+        self.snapshot = None
+        self._listener = None
+
+    def preload(self):
+        import pytest  # noqa: F401
+
+        from . import plugin, reporter  # noqa: F401
+
+        for module_name in _entry_point_plugins() + self.modules:
+            importlib.import_module(module_name)
+
+        self.snapshot = ModuleSnapshot()
+
+    def serve_forever(self):
+        self._listener = self._listen()
+        # Workers are reaped by the kernel, nobody waits on them
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+        pending = _fd_from_env(PENDING_FD_ENV)
+        while True:
+            if pending is not None:
+                conn, pending = pending, None
+            else:
+                conn, _ = self._listener.accept()
+
+            path = self.snapshot.changed()
+            if path is not None:
+                self._reload(conn, path)
+
+            if os.fork() == 0:
+                self._work(conn)
+            conn.close()
+
+    def close(self):
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _listen(self):
+        listener = _fd_from_env(LISTEN_FD_ENV)
+        if listener is not None:
+            return listener
+
+        if os.path.exists(self.path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except OSError:
+                # Left behind by a server that is gone
+                os.unlink(self.path)
+            else:
+                raise SystemExit(
+                    'pspec: a server is already listening on {}'.format(
+                        self.path
+                    )
+                )
+            finally:
+                probe.close()
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.path)
+        listener.listen(16)
+        sys.stderr.write('pspec: serving on {}\n'.format(self.path))
+        return listener
+
+    def _reload(self, conn, path):
+        """
+        Start over in a new interpreter, keeping the socket and the client.
+        """
+        sys.stderr.write('pspec: {} changed, reloading\n'.format(path))
+        env = dict(os.environ)
+        for name, sock in ((LISTEN_FD_ENV, self._listener),
+                           (PENDING_FD_ENV, conn)):
+            sock.set_inheritable(True)
+            env[name] = str(sock.fileno())
+
+        os.execve(
+            sys.executable,
+            [
+                sys.executable, '-m', 'pytest_pspec.server',
+                'serve', '--socket', self.path,
+            ] + self.modules,
+            env
+        )
+
+    def _work(self, conn):
+        code = 1
+        try:
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            self._listener.close()
+            line = _read_line(conn)
+            # e.g. another server checking whether this one is alive
+            if not line:
+                return
+            request = json.loads(line.decode('utf-8'))
+
+            done_r, done_w = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(done_r)
+                _run_pytest(conn, request)
+
+            os.close(done_w)
+            _wait_for_run(conn, done_r, pid)
+            _, status = os.waitpid(pid, 0)
+            if os.WIFSIGNALED(status):
+                code = 128 + os.WTERMSIG(status)
+            else:
+                code = os.WEXITSTATUS(status)
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            try:
+                conn.sendall(bytes([code & 0xff]))
+            except OSError:
+                pass
+            os._exit(0)
+
+
+def _wait_for_run(conn, done, pid):
+    """
+    Block until the run exits, which closes ``done``; interrupt it like a
+    Ctrl-C if the client hangs up first.
+    """
+    watched = [conn, done]
+    while True:
+        readable, _, _ = select.select(watched, [], [])
+        if done in readable:
+            return
+        if not conn.recv(1):
+            os.kill(pid, signal.SIGINT)
+            watched = [done]
+
+
+def _run_pytest(conn, request):
+    code = 1
+    try:
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(conn.fileno(), 1)
+        os.dup2(conn.fileno(), 2)
+        # Line buffered whatever the server's own stdout was
+        sys.stdout = open(1, 'w', buffering=1, encoding='utf-8', closefd=False)
+        sys.stderr = open(2, 'w', buffering=1, encoding='utf-8', closefd=False)
+
+        os.chdir(request['cwd'])
+        os.environ.clear()
+        os.environ.update(request['env'])
+        sys.argv = ['pspec'] + request['args']
+
+        import pytest
+
+        # Plugins imported by the server are too early for assert rewriting
+        code = int(pytest.main([
+            '--pspec',
+            '-W', 'ignore::pytest.PytestAssertRewriteWarning',
+        ] + request['args']))
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+
+
+def _read_line(conn):
+    data = b''
+    while not data.endswith(b'\n'):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def _fd_from_env(name):
+    fd = os.environ.pop(name, None)
+    if fd is None:
+        return None
+    sock = socket.socket(fileno=int(fd))
+    sock.set_inheritable(False)
+    return sock
+
+
+def _entry_point_plugins():
+    from importlib import metadata
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        entry_points = entry_points.select(group='pytest11')
+    else:
+        entry_points = entry_points.get('pytest11', ())
+    return [
+        entry_point.value.split(':', 1)[0] for entry_point in entry_points
+    ]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
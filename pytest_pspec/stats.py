@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+
+class ReportCount(object):
+    """
+    Stands in for the list of reports of a stats category when only their
+    number is kept, as with ``--pspec-lean-stats``.
+
+    It has the length of that list, counting the reports the summary line
+    counts, but nothing to iterate over.
+    """
+
+    __slots__ = ('count',)
+
+    def __init__(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(())
+
+    def __repr__(self):
+        return '{}(count={!r})'.format(type(self).__name__, self.count)
+
+    def append(self, report):
+        if getattr(report, 'count_towards_summary', True):
+            self.count += 1
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import os
+
+from . import models
+
+CACHE_KEY = 'pspec/titles'
+
+_UNCHECKED = object()
+
+
+class TitleStore(object):
+    """
+    Formatted nodes kept in pytest's cache between runs, grouped by module.
+
+    A module's entries are dropped once its file changes mtime or size, and
+    the whole store is dropped when the fingerprint (plugin version and the
+    ini values titles depend on) differs from the saved one.
+    """
+
+    def __init__(self, cache, rootpath, fingerprint, readonly=False):
+        self.cache = cache
+        self.rootpath = str(rootpath)
+        self.readonly = readonly
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._checked = {}
+
+        data = cache.get(CACHE_KEY, None)
+        if not isinstance(data, dict) or \
+                data.get('fingerprint') != fingerprint:
+            data = {'fingerprint': fingerprint, 'modules': {}}
+        self._data = data
+
+    def __contains__(self, nodeid):
+        entries = self._entries(nodeid)
+        return entries is not None and nodeid in entries
+
+    def get(self, nodeid):
+        entries = self._entries(nodeid)
+        if entries is None or nodeid not in entries:
+            return None
+
+        self.hits += 1
+        module_name, class_name, title = entries[nodeid]
+        return models.Node(
+            title=title,
+            class_name=class_name,
+            module_name=module_name
+        )
+
+    def put(self, nodeid, node):
+        # Every node put here had to be formatted, so it counts as a miss
+        self.misses += 1
+        entries = self._entries(nodeid)
+        if entries is not None:
+            entries[nodeid] = [node.module_name, node.class_name, node.title]
+            self._dirty = True
+
+    def save(self):
+        if self.readonly or not self._dirty:
+            return
+
+        modules = self._data['modules']
+        for path in list(modules):
+            if path not in self._checked and self._stamp(path) is None:
+                del modules[path]
+        self.cache.set(CACHE_KEY, self._data)
+        self._dirty = False
+
+    def _entries(self, nodeid):
+        path = nodeid.split('::', 1)[0]
+        entries = self._checked.get(path, _UNCHECKED)
+        if entries is not _UNCHECKED:
+            return entries
+
+        entries = None
+        stamp = self._stamp(path)
+        if stamp is not None:
+            modules = self._data['modules']
+            module = modules.get(path)
+            if module is None or module['stamp'] != stamp:
+                module = modules[path] = {'stamp': stamp, 'nodes': {}}
+            entries = module['nodes']
+
+        self._checked[path] = entries
+        return entries
+
+    def _stamp(self, path):
+        try:
+            stat = os.stat(os.path.join(self.rootpath, path))
+        except (OSError, ValueError):
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
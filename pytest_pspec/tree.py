@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import pytest
+
+from . import formatters
+
+
+class SpecNode(object):
+    """
+    A module or class of the spec tree, shared by every spec below it.
+
+    ``size`` is the number of specs directly in it, so the number of lines
+    its block will have.
+    """
+
+    __slots__ = ('title', 'parent', 'depth', 'size')
+
+    def __init__(self, title, parent=None):
+        self.title = title
+        self.parent = parent
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.size = 0
+
+    def __repr__(self):
+        return '{}(title={!r}, depth={!r}, size={!r})'.format(
+            type(self).__name__,
+            self.title,
+            self.depth,
+            self.size
+        )
+
+    @property
+    def path(self):
+        """The describe blocks down to this one: its classes or its module."""
+        path = []
+        node = self
+        while node is not None:
+            path.append(node)
+            node = node.parent
+        path.reverse()
+        # The module of a class isn't printed, only its classes are
+        return path[1:] or path
+
+    @property
+    def indent(self):
+        return max(self.depth - 1, 0) * 2
+
+
+class SpecTree(object):
+    """
+    Module → class → nested class → spec index of the collected items.
+
+    Built once after collection; each module and class becomes one
+    ``SpecNode`` and ``header`` finds the innermost one of a spec by nodeid.
+    """
+
+    def __init__(self, pattern_config):
+        self.pattern_config = pattern_config
+        self._nodes = {}
+        self._headers = {}
+
+    def __len__(self):
+        return len(self._headers)
+
+    @classmethod
+    def build(cls, items, pattern_config):
+        tree = cls(pattern_config)
+        for item in items:
+            tree.add(item)
+        return tree
+
+    def add(self, item):
+        node = None
+        for collector in item.listchain()[:-1]:
+            if isinstance(collector, (pytest.Module, pytest.Class)):
+                node = self._node(collector, node)
+
+        if node is not None:
+            node.size += 1
+            self._headers[item.nodeid] = node
+
+    def header(self, nodeid):
+        return self._headers.get(nodeid)
+
+    def _node(self, collector, parent):
+        node = self._nodes.get(collector.nodeid)
+        if node is None:
+            node = self._nodes[collector.nodeid] = SpecNode(
+                self._title(collector),
+                parent
+            )
+        return node
+
+    def _title(self, collector):
+        if isinstance(collector, pytest.Class):
+            return formatters.format_class_name(
+                collector.obj.__doc__ or collector.name,
+                self.pattern_config.classes
+            )
+        return formatters.format_module_name(
+            collector.nodeid.split('::', 1)[0],
+            self.pattern_config.files
+        )
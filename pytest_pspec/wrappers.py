@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+from .models import Result
+
 
 class Wrapper(object):
 
@@ -50,3 +52,45 @@ class UTF8Wrapper(Wrapper):
             outcome=outcome,
             node=self.wrapped.node
         )
+
+
+class Renderer(object):
+    """
+    Renders results straight from a table of outcome -> (prefix, suffix),
+    built once from the wrappers above for a given format and colour choice.
+    """
+
+    _OUTCOMES = ('passed', 'failed', 'skipped')
+
+    def __init__(self, utf8=True, color=True):
+        self._table = dict(
+            (outcome, self._affixes(outcome, utf8, color))
+            for outcome in self._OUTCOMES
+        )
+        self._default = self._affixes(None, utf8, color)
+
+    def __call__(self, result):
+        prefix, suffix = self._table.get(result.outcome, self._default)
+        return prefix + result.node.title + suffix
+
+    @staticmethod
+    def _affixes(outcome, utf8, color):
+        if utf8:
+            character = UTF8Wrapper._CHARACTER_BY_OUTCOME.get(
+                outcome,
+                UTF8Wrapper._default_character
+            )
+        else:
+            character = Result._OUTCOME_REPRESENTATION.get(
+                outcome,
+                Result._default_outcome_representation
+            )
+        prefix = ' {} '.format(character)
+        suffix = ''
+
+        color_code = ColorWrapper._COLOR_BY_OUTCOME.get(outcome, '')
+        if color and color_code:
+            prefix = color_code + prefix
+            suffix = ColorWrapper._color_reset
+
+        return prefix, suffix
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import queue
+import threading
+import time
+
+
+class BufferedFile(object):
+    """
+    File proxy placed under the terminal writer, so everything the reporter
+    prints is kept in order and handed to the real stream in large chunks.
+
+    ``flush`` calls coming from the terminal writer only go through once
+    ``interval`` seconds have passed; ``drain`` always writes.
+    """
+
+    def __init__(self, wrapped, size, interval=1.0):
+        self.wrapped = wrapped
+        self.size = size
+        self.interval = interval
+        self._chunks = []
+        self._pending_lines = 0
+        self._last_drain = time.monotonic()
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+    def write(self, msg):
+        self._chunks.append(msg)
+        self._pending_lines += msg.count('\n')
+
+        if self._pending_lines >= self.size:
+            self.drain()
+        return len(msg)
+
+    def flush(self):
+        if time.monotonic() - self._last_drain >= self.interval:
+            self.drain()
+
+    def drain(self):
+        if self._chunks:
+            msg = ''.join(self._chunks)
+            self._chunks = []
+            self._pending_lines = 0
+
+            try:
+                self.wrapped.write(msg)
+            except UnicodeEncodeError:
+                # Same fallback as the terminal writer uses for single writes
+                self.wrapped.write(
+                    msg.encode('unicode-escape').decode('ascii')
+                )
+
+        self.wrapped.flush()
+        self._last_drain = time.monotonic()
+
+
+class FooterFile(object):
+    """
+    File proxy keeping one footer line below the output written through it.
+
+    Writes first erase the footer and leave it erased; ``draw`` puts it back
+    only when the output ends at the start of a line, so the two are never
+    mixed. Both may be called from different threads.
+    """
+
+    CLEAR = '\r\x1b[K'
+
+    def __init__(self, wrapped):
+        self.wrapped = wrapped
+        self._lock = threading.Lock()
+        self._shown = False
+        self._at_line_start = True
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+    def write(self, msg):
+        with self._lock:
+            self._erase()
+            if msg:
+                self._at_line_start = msg.endswith('\n')
+            return self.wrapped.write(msg)
+
+    def draw(self, line):
+        with self._lock:
+            if not self._at_line_start:
+                return
+            self.wrapped.write(self.CLEAR + line)
+            self.wrapped.flush()
+            self._shown = True
+
+    def clear(self):
+        with self._lock:
+            self._erase()
+            self.wrapped.flush()
+
+    def _erase(self):
+        if self._shown:
+            self.wrapped.write(self.CLEAR)
+            self._shown = False
+
+
+class AsyncFile(object):
+    """
+    File proxy handing writes to a background thread through a queue of
+    ``size`` entries, so a slow stream doesn't hold up the test loop.
+
+    Writes block once the queue is full. The thread joins whatever is queued
+    into batches of up to ``batch`` writes; ``drain`` waits until everything
+    queued so far is written, while ``flush`` calls from the terminal writer
+    are left to the thread. Once closed, writes go straight to ``wrapped``.
+    """
+
+    def __init__(self, wrapped, size, batch=256):
+        self.wrapped = wrapped
+        self.batch = batch
+        self._queue = queue.Queue(size)
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name='pspec-writer',
+            daemon=True
+        )
+        self._thread.start()
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+    def write(self, msg):
+        if self._closed:
+            return self.wrapped.write(msg)
+
+        self._queue.put(msg)
+        return len(msg)
+
+    def flush(self):
+        if self._closed:
+            self.wrapped.flush()
+
+    def drain(self):
+        self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self):
+        if not self._closed:
+            self._queue.put(None)
+            self._thread.join()
+            self._closed = True
+            self.drain()
+
+    def _run(self):
+        stopped = False
+        while not stopped:
+            chunks = [self._queue.get()]
+            while len(chunks) < self.batch:
+                try:
+                    chunks.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopped = None in chunks
+            try:
+                self._write(''.join(filter(None, chunks)))
+            except Exception as error:
+                self._error = error
+            finally:
+                for _ in chunks:
+                    self._queue.task_done()
+
+    def _write(self, msg):
+        if msg:
+            try:
+                self.wrapped.write(msg)
+            except UnicodeEncodeError:
+                # Same fallback as the terminal writer uses for single writes
+                self.wrapped.write(
+                    msg.encode('unicode-escape').decode('ascii')
+                )
+        self.wrapped.flush()
+
+
+def duplicate(stream):
+    """
+    A new text stream on a duplicate of ``stream``'s file descriptor, or
+    None if it has none.
+
+    Output written from another thread while a test runs must go through
+    one, because pytest's capture takes over the original descriptor.
+    """
+    try:
+        fd = os.dup(stream.fileno())
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+    return io.open(
+        fd,
+        'w',
+        encoding=getattr(stream, 'encoding', None),
+        errors=getattr(stream, 'errors', None),
+        buffering=1
+    )
+
+
+class JsonLinesWriter(object):
+    """
+    Streams one JSON object per line to ``path``. Writes go through the
+    file's own buffer and are flushed at least every ``interval`` seconds,
+    so the file can be tailed while the session runs.
+    """
+
+    def __init__(self, path, interval=1.0):
+        self.path = path
+        self.interval = interval
+        self._file = open(path, 'w', encoding='utf-8')
+        self._last_flush = time.monotonic()
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        if time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def export_nodes(path, nodeids, table):
+    """
+    Write ``nodeids`` and their ``models.NodeTable`` to ``path`` as one JSON
+    object of parallel columns.
+    """
+    columns = table.to_columns()
+    columns['nodeids'] = list(nodeids)
+    with open(path, 'w', encoding='utf-8') as export:
+        json.dump(columns, export, ensure_ascii=False)
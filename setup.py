@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import os
+import re
 
 from setuptools import setup
 
@@ -11,9 +12,17 @@ def read(fname):
         return f.read()
 
 
+def version():
+    match = re.search(
+        r"__version__ = '(.+)'",
+        read('pytest_pspec/__init__.py')
+    )
+    return match.group(1)
+
+
 setup(
     name='pytest-pspec',
-    version='0.0.4',
+    version=version(),
     description='A rspec format reporter for Python ptest',
     long_description=read('README.rst'),
     author='Gowtham Sai',
@@ -21,9 +30,9 @@ setup(
     url='https://github.com/gowtham-sai/pytest-pspec',
     keywords='pytest pspec test report bdd rspec',
     install_requires=[
-        'pytest>=3.0.0',
-        'six>=1.11.0',
+        'pytest>=8.0',
     ],
+    python_requires='>=3.8',
     scripts=['bin/pspec'],
     packages=['pytest_pspec'],
     classifiers=[
@@ -32,11 +41,12 @@ setup(
         'Intended Audience :: Developers',
         'Topic :: Software Development :: Testing',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
         'Programming Language :: Python :: Implementation :: CPython',
         'Programming Language :: Python :: Implementation :: PyPy',
         'Operating System :: OS Independent',
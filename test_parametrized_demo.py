@@ -3,9 +3,10 @@
 """
 Demo script to show the current parametrized test issue and the fix
 """
-import tempfile
-import subprocess
 import os
+import subprocess
+import tempfile
+
 
 def test_current_behavior():
     """Test the current behavior with parametrized tests"""
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from pytest_pspec.durations import Durations
+from pytest_pspec.models import Node
+
+
+class TestDurations(object):
+
+    def test_should_keep_only_the_slowest_specs(self):
+        durations = Durations(2)
+
+        for number in range(1000):
+            node = Node('spec {}'.format(number), 'Foo', 'module')
+            durations.add(node, number % 100 / 10.0)
+
+        slowest = durations.slowest_specs()
+        assert len(durations._specs) == 2
+        assert [duration for duration, _ in slowest] == [9.9, 9.9]
+
+    def test_should_sum_the_durations_per_header(self):
+        durations = Durations(2)
+
+        durations.add(Node('foo', 'Foo', 'module'), 1.0)
+        durations.add(Node('bar', 'Foo', 'module'), 2.0)
+        durations.add(Node('baz', '', 'module'), 0.5)
+        durations.add(Node('qux', 'Foo', 'other module'), 0.1)
+
+        assert list(durations.header_summary_lines()) == [
+            '    3.00s  Foo (module, 2 specs)',
+            '    0.50s  module (1 spec)',
+        ]
+
+    def test_should_name_specs_with_their_header(self):
+        durations = Durations(1)
+
+        durations.add(Node('bar', '', 'module'), 0.25)
+
+        assert list(durations.summary_lines()) == ['    0.25s  module: bar']
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import collections
+import random
+import re
+
 import pytest
+
 from pytest_pspec import formatters
 
 
@@ -55,6 +60,46 @@ class TestFormatClassName(object):
         assert formatted == expected
 
 
+def _legacy_format_class_name(class_name, patterns):
+    formatted = ''
+
+    class_name = _legacy_remove_patterns(class_name, patterns)
+    if ' ' not in class_name:
+        for index, letter in enumerate(class_name):
+            letter_before = class_name[index - 1] if index > 0 else ''
+            letter_after = (
+                class_name[index + 1] if index < len(class_name) - 1 else ''
+            )
+            if letter.isupper() and \
+                    (letter_before.islower() or letter_after.islower()):
+                formatted += ' '
+
+            formatted += letter
+    else:
+        formatted = class_name
+
+    return formatted.strip()
+
+
+class TestFormatClassNameProperties(object):
+
+    ALPHABET = 'aAbBzZ09_ ÉéßΣσ'
+
+    @pytest.mark.parametrize('seed', range(20))
+    def test_should_match_the_original_implementation(self, seed):
+        rng = random.Random(seed)
+
+        for _ in range(200):
+            class_name = ''.join(
+                rng.choice(self.ALPHABET)
+                for _ in range(rng.randint(0, 40))
+            )
+
+            assert formatters.format_class_name(class_name, ['Test*']) == (
+                _legacy_format_class_name(class_name, ['Test*'])
+            )
+
+
 class TestFormatModuleName(object):
 
     @pytest.fixture
@@ -92,3 +137,214 @@ class TestFormatModuleName(object):
         )
 
         assert formatted == 'module'
+
+
+def _legacy_remove_patterns(statement, patterns):
+    for glob_pattern in patterns:
+        pattern = glob_pattern.replace('*', '')
+
+        if glob_pattern.startswith('*'):
+            pattern = '{0}$'.format(pattern)
+            statement = re.sub(pattern, '', statement)
+
+        elif glob_pattern.endswith('*'):
+            pattern = '^{0}'.format(pattern)
+            statement = re.sub(pattern, '', statement)
+
+        elif '*' in glob_pattern:
+            infix_patterns = glob_pattern.split('*', 2)
+            infix_patterns[0] = '{}*'.format(infix_patterns[0])
+            infix_patterns[1] = '*{}'.format(infix_patterns[1])
+            statement = _legacy_remove_patterns(statement, infix_patterns)
+
+        else:
+            pattern = '^{0}'.format(pattern)
+            statement = re.sub(pattern, '', statement)
+
+    return statement
+
+
+class TestPatternMatcher(object):
+
+    PATTERNS = (
+        ['test*'],
+        ['Test*'],
+        ['test_*.py', '*_test.py'],
+        ['test*.py'],
+        ['*spec.py'],
+        ['it*', 'test*'],
+        ['Describe*', '*Test'],
+        ['check*', '*'],
+        ['a*b*c*d'],
+        ['test'],
+    )
+    STATEMENTS = (
+        'test_a_thing',
+        'a_thing_test',
+        'test_module.py',
+        'tests/sub/test_module.py',
+        'foo_test.py',
+        'module_spec.py',
+        'it_runs',
+        'TestAThing',
+        'DescribeTest',
+        'testtest',
+        'abcd',
+        'a thing test\n',
+        'Checking if {test_input} = {expected}...',
+        '',
+    )
+
+    @pytest.mark.parametrize('patterns', PATTERNS)
+    def test_should_match_the_uncompiled_implementation(self, patterns):
+        matcher = formatters.PatternMatcher(patterns)
+
+        for statement in self.STATEMENTS:
+            assert matcher.remove(statement) == (
+                _legacy_remove_patterns(statement, patterns)
+            )
+
+    def test_should_be_accepted_by_the_formatters(self):
+        matcher = formatters.PatternMatcher(['test*'])
+
+        assert formatters.format_title('test_a_thing', matcher) == 'a thing'
+        assert formatters.compile_patterns(matcher) is matcher
+
+
+class TestRenderDocstring(object):
+
+    @pytest.mark.parametrize('template,params,expected', (
+        (
+            'Checking if {a} = {b}',
+            {'a': '3 + 5', 'b': 8},
+            'Checking if 3 + 5 = 8'
+        ),
+        ('{a!r:>6}', {'a': 'x'}, "   'x'"),
+        ('{a:{width}}|', {'a': 1, 'width': 3}, '  1|'),
+        ('{a.real}', {'a': 2}, '2'),
+        ('no fields', {'a': 1}, 'no fields'),
+        ('{{escaped}}', {'a': 1}, '{escaped}'),
+    ))
+    def test_should_render_like_str_format(self, template, params, expected):
+        rendered = formatters.render_docstring(template, params)
+
+        assert rendered == expected == template.format(**params)
+
+    @pytest.mark.parametrize('template,params', (
+        ('Testing {missing_key}', {'value': 1}),
+        ('{a:{width}}', {'a': 1}),
+        ('unbalanced {', {'value': 1}),
+        ('positional {} and {0}', {'value': 1}),
+        ('{a.missing}', {'a': 1}),
+        ('{a:d}', {'a': 'not a number'}),
+    ))
+    def test_should_return_none_when_it_cannot_render(self, template, params):
+        assert formatters.render_docstring(template, params) is None
+
+    def test_should_return_a_docstring_without_placeholders_as_is(self):
+        docstring = 'it works'
+
+        assert formatters.render_docstring(docstring, {}) is docstring
+
+    def test_should_bound_large_values_with_a_limit(self):
+        rendered = formatters.render_docstring(
+            '{text} in {items!r}',
+            {'text': 'x' * 1000, 'items': ['y' * 10 ** 6] * 3},
+            20
+        )
+
+        assert rendered.startswith('xxxxxxxxxxxxxxxxxxxx... in [')
+        assert len(rendered) < 60
+
+    def test_should_keep_small_values_as_they_are(self):
+        rendered = formatters.render_docstring(
+            '{items[0]} of {count:d}',
+            {'items': [1, 2], 'count': 3},
+            20
+        )
+
+        assert rendered == '1 of 3'
+
+
+class TestFormatParamValue(object):
+
+    class FakeArray(object):
+        shape = (1000, 1000)
+        size = 1000000
+        dtype = 'float64'
+
+        def __str__(self):
+            raise AssertionError('the full array must not be rendered')
+
+    class FakeFrame(object):
+        shape = (500, 3)
+        size = 1500
+
+    class OrderedDict(collections.OrderedDict):
+        reprs = []
+
+        def __repr__(self):
+            self.reprs.append(self)
+            return 'the full repr'
+
+    class Point(collections.namedtuple('Point', 'x y')):
+        reprs = []
+
+        def __repr__(self):
+            self.reprs.append(self)
+            return 'the full repr'
+
+    @pytest.mark.parametrize('value,expected', (
+        ('3 + 5', "'3 + 5'"),
+        (8, '8'),
+        (None, 'None'),
+        ([1, 2], '[1, 2]'),
+        (b'abc', "b'abc'"),
+    ))
+    def test_should_render_small_values_like_str(self, value, expected):
+        assert formatters.format_param_value(value, 20) == expected
+
+    def test_should_slice_long_strings_before_quoting(self):
+        assert formatters.format_param_value('x' * 1000, 5) == "'xxxxx...'"
+
+    def test_should_summarize_large_byte_payloads(self):
+        formatted = formatters.format_param_value(b'\0' * 4096, 20)
+
+        assert formatted == 'bytes(len=4096)'
+
+    def test_should_summarize_arrays_by_shape_and_dtype(self):
+        formatted = formatters.format_param_value(self.FakeArray(), 20)
+
+        assert formatted == 'FakeArray(shape=(1000, 1000), dtype=float64)'
+
+    def test_should_summarize_frames_by_shape(self):
+        formatted = formatters.format_param_value(self.FakeFrame(), 20)
+
+        assert formatted == 'FakeFrame(shape=(500, 3))'
+
+    def test_should_bound_large_containers(self):
+        formatted = formatters.format_param_value(list(range(10000)), 20)
+
+        assert formatted.startswith('[0, 1, 2, 3, 4, ...')
+        assert len(formatted) <= 23
+
+    def test_should_bound_the_items_of_small_containers(self):
+        formatted = formatters.format_param_value(['x' * 10 ** 7] * 3, 20)
+
+        assert len(formatted) <= 23
+
+    @pytest.mark.parametrize('value', (
+        OrderedDict(a='x' * 10 ** 7, b=2),
+        Point('x' * 10 ** 7, 2),
+    ), ids=['ordered dict', 'namedtuple'])
+    def test_should_bound_the_items_of_container_subclasses(self, value):
+        formatted = formatters.format_param_value(value, 20)
+
+        assert formatted.startswith(type(value).__name__ + '(')
+        assert len(formatted) <= 23
+        assert type(value).reprs == []
+
+    def test_should_not_bound_anything_without_a_limit(self):
+        assert formatters.format_param_value('x' * 1000) == (
+            "'{}'".format('x' * 1000)
+        )
@@ -4,7 +4,13 @@ from __future__ import unicode_literals
 import pytest
 
 from pytest_pspec import formatters
-from pytest_pspec.models import Node, PatternConfig, Result
+from pytest_pspec.models import (
+    Node,
+    NodeCache,
+    PatternConfig,
+    Result,
+    parse_many
+)
 
 
 @pytest.fixture
@@ -51,6 +57,15 @@ class TestNode(object):
 
         assert node.class_name == class_name
 
+    def test_parse_should_keep_display_parts_whole(self, pattern_config):
+        node = Node.parse(
+            ('tests/test_module.py', 'Parses a::b', "ids with value='a::b'"),
+            pattern_config
+        )
+
+        assert node.class_name == 'Parses a::b'
+        assert node.title == "ids with value='a::b'"
+
     def test_repr_should_return_a_string_representation_of_itself(self, node):
         from_repr = eval(repr(node))
 
@@ -59,6 +74,104 @@ class TestNode(object):
         assert from_repr.module_name == node.module_name
 
 
+class TestParseMany(object):
+
+    @pytest.fixture
+    def pattern_config(self):
+        return PatternConfig(
+            files=['test_*.py'],
+            functions=['test*'],
+            classes=['Test*']
+        )
+
+    @pytest.fixture
+    def nodeids(self):
+        return [
+            'tests/test_module.py::TestFoo::test_foo',
+            'tests/test_module.py::TestFoo::test_bar',
+            'tests/test_module.py::test_baz',
+            'tests/test_other.py::TestFoo::test_foo',
+            'tests/test_other.py::::test_qux',
+            'tests/test_other.py::TestBar::()::test_foo',
+        ]
+
+    def test_should_parse_like_node_parse(self, pattern_config, nodeids):
+        table = parse_many(nodeids, pattern_config)
+
+        assert len(table) == len(nodeids)
+        assert [repr(node) for node in table] == [
+            repr(Node.parse(nodeid, pattern_config)) for nodeid in nodeids
+        ]
+
+    def test_should_store_each_name_once(self, pattern_config, nodeids):
+        table = parse_many(nodeids, pattern_config)
+
+        assert sorted(table.strings) == sorted(set(table.strings))
+        assert table.to_columns()['modules'] == [0, 0, 0, 6, 6, 6]
+
+    def test_should_format_each_distinct_part_once(
+        self,
+        pattern_config,
+        nodeids,
+        monkeypatch
+    ):
+        formatted = []
+        format_class_name = formatters.format_class_name
+
+        def counting_format_class_name(class_name, patterns):
+            formatted.append(class_name)
+            return format_class_name(class_name, patterns)
+
+        monkeypatch.setattr(
+            formatters,
+            'format_class_name',
+            counting_format_class_name
+        )
+
+        parse_many(nodeids * 100, pattern_config)
+
+        assert sorted(formatted) == ['', 'TestBar', 'TestFoo', 'test_baz']
+
+
+class TestNodeCache(object):
+
+    @pytest.fixture
+    def pattern_config(self):
+        return PatternConfig(
+            files=['test_*.py'],
+            functions=['test*'],
+            classes=['Test*']
+        )
+
+    def test_parse_should_return_the_same_node_as_without_cache(
+        self,
+        pattern_config
+    ):
+        nodeid = 'tests/test_module.py::TestClassName::test_title'
+        cached = Node.parse(nodeid, pattern_config, NodeCache())
+        uncached = Node.parse(nodeid, pattern_config)
+
+        assert repr(cached) == repr(uncached)
+
+    def test_should_format_a_shared_header_once(self, pattern_config):
+        cache = NodeCache()
+        for index in range(10):
+            nodeid = 'tests/test_module.py::TestClassName::test_{}'.format(
+                index
+            )
+            Node.parse(nodeid, pattern_config, cache)
+
+        assert cache.misses == 11
+        assert cache.hits == 9
+
+    def test_should_evict_the_least_recently_used_entry(self, pattern_config):
+        cache = NodeCache(maxsize=2)
+        for title in ('test_a', 'test_b', 'test_a', 'test_c'):
+            Node.parse('test_module.py::::' + title, pattern_config, cache)
+
+        assert list(cache.titles) == ['test_a', 'test_c']
+
+
 class TestResult(object):
 
     @pytest.fixture
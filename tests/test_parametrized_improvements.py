@@ -98,6 +98,53 @@ class TestParametrizedTestFormatting(object):
         assert 'with bad docstring with value=1' in result.stdout.str()
         assert 'with bad docstring with value=2' in result.stdout.str()
 
+    def test_should_truncate_long_parameter_values(self, testdir):
+        """Test that huge values are bounded by pspec_param_max_len"""
+        testdir.makeini("""
+            [pytest]
+            pspec_param_max_len=10
+        """)
+        testdir.makepyfile("""
+            import pytest
+
+            @pytest.mark.parametrize("payload", ["x" * 100000])
+            def test_upload(payload):
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec')
+
+        assert "upload with payload='xxxxxxxxxx...'" in result.stdout.str()
+
+    def test_should_not_truncate_parameter_values_by_default(self, testdir):
+        """Test that values are only bounded once a limit is configured"""
+        testdir.makepyfile("""
+            import pytest
+
+            @pytest.mark.parametrize("payload", ["x" * 1000])
+            def test_upload(payload):
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec')
+
+        assert "upload with payload='{}'".format('x' * 1000) in \
+            result.stdout.str()
+
+    def test_should_use_the_pytest_id_for_opaque_objects(self, testdir):
+        """Test that objects without a readable str use the pytest id"""
+        testdir.makepyfile("""
+            import pytest
+
+            @pytest.mark.parametrize("client", [object()], ids=["local"])
+            def test_connects(client):
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec')
+
+        assert 'connects [local]' in result.stdout.str()
+
 
 class TestFormatParametrizedTestNameFunction(object):
     """Tests for the _format_parametrized_test_name helper function"""
@@ -134,6 +181,16 @@ class TestFormatParametrizedTestNameFunction(object):
         result = _format_parametrized_test_name('test_simple', MockCallspec())
         assert result == 'simple'
 
+    def test_should_bound_values_to_max_len(self):
+        """Test that values longer than max_len are truncated"""
+        class MockCallspec:
+            params = {'payload': 'x' * 1000}
+
+        result = _format_parametrized_test_name(
+            'test_upload', MockCallspec(), 3
+        )
+        assert result == "upload with payload='xxx...'"
+
     def test_should_handle_none_callspec(self):
         """Test handling when callspec is None"""
         result = _format_parametrized_test_name('test_simple', None)
@@ -1,7 +1,17 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import io
+import json
+import os
+import pstats
+import subprocess
+import sys
+import time
+import types
+
 import pytest
+from _pytest import reports
 from _pytest.config import ExitCode
 
 
@@ -36,6 +46,41 @@ class TestReport(object):
         expected = 'test_should_not_modify_nodeid_when_disabled_test.py::test_a_feature_is_working'
         assert expected in result.stdout.str()
 
+    def test_should_keep_last_failed_working(self, testdir):
+        testdir.makepyfile("""
+            def test_a_feature_is_working():
+                pass
+
+            def test_a_broken_feature():
+                assert False
+        """)
+
+        testdir.runpytest('--pspec')
+        result = testdir.runpytest('--pspec', '--lf')
+
+        assert '✗ a broken feature' in result.stdout.str()
+        assert 'a feature is working' not in result.stdout.str()
+        result.assert_outcomes(failed=1, passed=0)
+
+    def test_should_keep_deselect_working(self, testdir):
+        testdir.makepyfile("""
+            class TestFoo(object):
+                def test_kept(self):
+                    pass
+
+                def test_dropped(self):
+                    pass
+        """)
+
+        result = testdir.runpytest(
+            '--pspec',
+            '--deselect',
+            'test_should_keep_deselect_working.py::TestFoo::test_dropped'
+        )
+
+        assert '✓ kept' in result.stdout.str()
+        assert 'dropped' not in result.stdout.str()
+
     def test_should_print_a_red_failing_test(self, testdir):
         testdir.makepyfile("""
             def test_a_failed_test_of_a_feature():
@@ -102,6 +147,30 @@ class TestReport(object):
         lines = result.stdout.get_lines_after('Bar')
         assert '✓ bar' in lines[0]
 
+    def test_should_indent_nested_classes(self, testdir):
+        testdir.makepyfile("""
+            class TestOuter(object):
+                def test_foo(self):
+                    pass
+
+                class TestInner(object):
+                    def test_bar(self):
+                        pass
+
+                def test_baz(self):
+                    pass
+        """)
+        result = testdir.runpytest('--pspec', '--color=no')
+
+        result.stdout.re_match_lines([
+            r'^Outer$',
+            r'^ ✓ foo$',
+            r'^  Inner$',
+            r'^   ✓ bar$',
+            r'^Outer$',
+            r'^ ✓ baz$',
+        ])
+
     def test_should_print_the_module_name_of_a_test_without_class(
         self,
         testdir
@@ -123,6 +192,716 @@ class TestReport(object):
         result = testdir.runpytest('--pspec')
         assert '1 passed' in result.stdout.str()
 
+    def test_should_print_node_cache_counters_when_verbose(self, testdir):
+        testdir.makepyfile("""
+            class TestFoo(object):
+                def test_foo(self):
+                    pass
+
+                def test_bar(self):
+                    pass
+        """)
+
+        result = testdir.runpytest('--pspec', '-v')
+
+        result.stdout.fnmatch_lines(['node cache: 1 hits, 3 misses'])
+        assert 'node cache' not in testdir.runpytest('--pspec').stdout.str()
+
+    def test_should_reuse_titles_stored_by_an_earlier_run(self, testdir):
+        testdir.makeini("""
+            [pytest]
+            pspec_title_cache=true
+        """)
+        testdir.makepyfile("""
+            import pytest
+
+            class TestFoo(object):
+                def test_foo(self):
+                    pass
+
+                @pytest.mark.parametrize('value', (1, 2))
+                def test_bar(self, value):
+                    pass
+        """)
+
+        first = testdir.runpytest('--pspec', '-v')
+        second = testdir.runpytest('--pspec', '-v')
+
+        first.stdout.fnmatch_lines(['title cache: 0 hits, 3 misses'])
+        second.stdout.fnmatch_lines([
+            'Foo',
+            '*✓ foo*',
+            '*✓ bar with value=1*',
+            '*✓ bar with value=2*',
+            '*title cache: 3 hits, 0 misses',
+        ])
+
+    def test_should_forget_titles_of_a_changed_module(self, testdir):
+        testdir.makeini("""
+            [pytest]
+            pspec_title_cache=true
+        """)
+        source = """
+            def test_a_feature_is_working():
+                '''{}'''
+        """
+        testdir.makepyfile(source.format('Works'))
+        testdir.runpytest('--pspec')
+
+        testdir.makepyfile(source.format('Works again'))
+        result = testdir.runpytest('--pspec')
+
+        assert '✓ Works again' in result.stdout.str()
+
+    def test_should_forget_titles_when_the_patterns_change(self, testdir):
+        testdir.makepyfile("""
+            def test_a_feature_is_working():
+                pass
+        """)
+        testdir.makeini("""
+            [pytest]
+            pspec_title_cache=true
+        """)
+        testdir.runpytest('--pspec')
+
+        testdir.makeini("""
+            [pytest]
+            pspec_title_cache=true
+            python_functions=test_a_*
+        """)
+        result = testdir.runpytest('--pspec')
+
+        assert '✓ feature is working' in result.stdout.str()
+
+    def test_should_not_store_titles_by_default(self, testdir):
+        testdir.makeconftest("""
+            pytest_plugins = 'pytest_pspec.plugin'
+
+            VALUE = 1
+        """)
+        source = """
+            import pytest
+
+            from conftest import VALUE
+
+            @pytest.mark.parametrize('value', (VALUE,))
+            def test_a_feature(value):
+                pass
+        """
+        testdir.makepyfile(source)
+        testdir.runpytest('--pspec')
+
+        # Only the test module's own file would tell a stored title is stale
+        testdir.makeconftest("""
+            pytest_plugins = 'pytest_pspec.plugin'
+
+            VALUE = 2
+        """)
+        result = testdir.runpytest('--pspec', '-v')
+
+        assert '✓ a feature with value=2' in result.stdout.str()
+        assert 'title cache' not in result.stdout.str()
+        assert testdir.parseconfigure().cache.get('pspec/titles', None) is None
+
+    @pytest.mark.parametrize('buffer_size', ('2', '1000', 'auto'))
+    def test_should_print_the_same_lines_when_buffered(
+        self,
+        testdir,
+        buffer_size
+    ):
+        testdir.makepyfile("""
+            class TestFoo(object):
+                def test_foo(self):
+                    pass
+
+                def test_bar(self):
+                    assert False
+
+            def test_baz():
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec', '--pspec-buffer', buffer_size)
+
+        result.stdout.fnmatch_lines([
+            'Foo',
+            '*✓ foo*',
+            '*✗ bar*',
+            'should print the same lines when buffered',
+            '*✓ baz*',
+            '*[[]100%[]]',
+            '*1 failed, 2 passed*',
+        ])
+
+    def test_should_flush_the_buffer_on_keyboard_interrupt(self, testdir):
+        testdir.makepyfile("""
+            def test_a_feature_is_working():
+                pass
+
+            def test_interrupting():
+                raise KeyboardInterrupt
+        """)
+
+        result = testdir.runpytest(
+            '--pspec',
+            '--pspec-buffer',
+            '1000',
+            no_reraise_ctrlc=True
+        )
+
+        assert '✓ a feature is working' in result.stdout.str()
+        assert 'KeyboardInterrupt' in result.stdout.str()
+
+    def test_should_print_the_slowest_specs_and_headers(self, testdir):
+        testdir.makepyfile("""
+            import time
+
+            class TestFoo(object):
+                def test_slow(self):
+                    time.sleep(0.1)
+
+                def test_fast(self):
+                    pass
+
+            def test_fastest():
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec', '--pspec-durations=1')
+
+        result.stdout.fnmatch_lines([
+            '*slowest 1 specs*',
+            '*0.1?s  Foo: slow',
+            '*slowest 1 headers*',
+            '*0.1?s  Foo (should print the slowest specs and headers, '
+            '2 specs)',
+        ])
+        assert 'fastest' not in result.stdout.str().split('slowest 1')[1]
+
+    def test_should_not_draw_a_progress_footer_off_a_terminal(self, testdir):
+        testdir.makepyfile("""
+            def test_a_feature_is_working():
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec', '--pspec-progress')
+
+        assert '✓ a feature is working' in result.stdout.str()
+        assert '\x1b[K' not in result.stdout.str()
+
+    def test_should_draw_a_progress_footer_on_a_terminal(self, testdir):
+        from pytest_pspec.reporter import PspecTerminalReporter
+
+        class Terminal(io.StringIO):
+            def isatty(self):
+                return True
+
+        config = testdir.parseconfigure('--pspec', '--pspec-progress')
+        terminal = Terminal()
+        reporter = PspecTerminalReporter(config, terminal)
+        reporter._session = types.SimpleNamespace(testscollected=2)
+        # Leaves no unfinished path line the footer would have to wait for
+        reporter.showfspath = False
+
+        reporter.pytest_runtest_logstart(
+            'test_module.py::test_foo',
+            ('test_module.py', 0, 'test_foo')
+        )
+        reporter._footer.file.draw(reporter._footer.line(time.monotonic()))
+        reporter.pytest_runtest_logfinish('test_module.py::test_foo')
+        reporter._stop_footer()
+
+        assert '\r\x1b[K0/2 | 0.0 tests/s | slowest: test_module.py::test_foo'\
+            in terminal.getvalue()
+        assert terminal.getvalue().endswith('\r\x1b[K')
+
+    @pytest.mark.parametrize('options', (
+        ('--pspec-async',),
+        ('--pspec-async', '--pspec-buffer', '2'),
+    ))
+    def test_should_print_the_same_lines_from_the_writer_thread(
+        self,
+        testdir,
+        options
+    ):
+        testdir.makepyfile("""
+            class TestFoo(object):
+                def test_foo(self):
+                    pass
+
+                def test_bar(self):
+                    assert False
+
+            def test_baz():
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec', *options)
+
+        result.stdout.fnmatch_lines([
+            'Foo',
+            '*✓ foo*',
+            '*✗ bar*',
+            'should print the same lines from the writer thread',
+            '*✓ baz*',
+            '*[[]100%[]]',
+            '*1 failed, 2 passed*',
+        ])
+
+    def test_should_drain_the_writer_thread_on_keyboard_interrupt(
+        self,
+        testdir
+    ):
+        testdir.makepyfile("""
+            def test_a_feature_is_working():
+                pass
+
+            def test_interrupting():
+                raise KeyboardInterrupt
+        """)
+
+        result = testdir.runpytest(
+            '--pspec',
+            '--pspec-async',
+            no_reraise_ctrlc=True
+        )
+
+        assert '✓ a feature is working' in result.stdout.str()
+        assert 'KeyboardInterrupt' in result.stdout.str()
+
+    def test_should_close_the_duplicated_stream(self, testdir, monkeypatch):
+        import pytest_pspec
+
+        monkeypatch.setenv(
+            'PYTHONPATH',
+            os.path.dirname(os.path.dirname(pytest_pspec.__file__))
+        )
+        testdir.makepyfile("""
+            def test_a_feature_is_working():
+                pass
+        """)
+
+        result = testdir.run(
+            sys.executable, '-X', 'dev', '-m', 'pytest',
+            '--pspec', '--pspec-async'
+        )
+
+        assert result.ret == 0
+        assert 'ResourceWarning' not in result.stderr.str()
+
+    def test_should_reject_an_invalid_buffer_size(self, testdir):
+        result = testdir.runpytest('--pspec', '--pspec-buffer', 'lots')
+
+        assert result.ret == ExitCode.USAGE_ERROR
+
+    def test_should_print_xdist_blocks_contiguously(self, testdir):
+        pytest.importorskip('xdist')
+        testdir.makepyfile("""
+            import pytest
+
+            class TestAlpha(object):
+                @pytest.mark.parametrize('value', range(6))
+                def test_alpha(self, value):
+                    pass
+
+            class TestBeta(object):
+                @pytest.mark.parametrize('value', range(6))
+                def test_beta(self, value):
+                    pass
+        """)
+
+        result = testdir.runpytest('--pspec', '-n', '2')
+
+        lines = result.stdout.lines
+        alpha = lines.index('Alpha')
+        beta = lines.index('Beta')
+        assert all('✓ alpha' in line for line in lines[alpha + 1:alpha + 7])
+        assert all('✓ beta' in line for line in lines[beta + 1:beta + 7])
+        assert lines.count('Alpha') == lines.count('Beta') == 1
+        assert '12 passed' in result.stdout.str()
+
+    @pytest.mark.parametrize(
+        'args',
+        [(), ('-n', '2')],
+        ids=['serial', 'xdist']
+    )
+    def test_should_collapse_parametrized_functions(self, testdir, args):
+        if args:
+            pytest.importorskip('xdist')
+        testdir.makepyfile("""
+            import pytest
+
+            class TestChecksum(object):
+                @pytest.mark.parametrize('value', range(50))
+                def test_computes_checksum(self, value):
+                    assert value != 7
+
+                @pytest.mark.parametrize('value', range(3))
+                def test_is_stable(self, value):
+                    pass
+        """)
+
+        result = testdir.runpytest(
+            '--pspec',
+            '--pspec-collapse-params',
+            '--color=no',
+            *args
+        )
+
+        result.stdout.fnmatch_lines([
+            ' ✗ computes checksum (49/50)',
+            '   ✗ computes checksum with value=7',
+        ])
+        result.stdout.fnmatch_lines([' ✓ is stable (3/3)'])
+        assert 'value=8' not in result.stdout.str()
+        assert '1 failed, 52 passed' in result.stdout.str()
+
+    def test_should_collapse_cases_failing_in_setup(self, testdir):
+        testdir.makepyfile("""
+            import pytest
+
+            @pytest.fixture
+            def checked(value):
+                assert value != 2
+
+            class TestFirst(object):
+                @pytest.mark.parametrize('value', range(4))
+                def test_computes_checksum(self, value, checked):
+                    pass
+
+                @pytest.mark.parametrize('value', (2, 2))
+                def test_is_stable(self, value, checked):
+                    pass
+
+            class TestLater(object):
+                def test_runs_later(self):
+                    pass
+        """)
+
+        result = testdir.runpytest(
+            '--pspec',
+            '--pspec-collapse-params',
+            '--color=no'
+        )
+
+        result.stdout.fnmatch_lines([
+            'First',
+            ' ✗ computes checksum (3/4)',
+            '   ✗ computes checksum with value=2',
+            ' ✗ is stable (0/2)',
+            '   ✗ is stable with value=2',
+            '   ✗ is stable with value=2',
+            'Later',
+            ' ✓ runs later',
+        ])
+        assert result.stdout.lines.count('First') == 1
+
+    def test_should_print_unfinished_parametrized_functions(self, testdir):
+        testdir.makepyfile("""
+            import pytest
+
+            @pytest.mark.parametrize('value', range(10))
+            def test_computes_checksum(value):
+                assert value != 3
+        """)
+
+        result = testdir.runpytest(
+            '--pspec',
+            '--pspec-collapse-params',
+            '--color=no',
+            '-x'
+        )
+
+        result.stdout.fnmatch_lines([
+            ' ✗ computes checksum (3/10)',
+            '   ✗ computes checksum with value=3',
+        ])
+
+    @pytest.mark.parametrize(
+        'args',
+        [(), ('-n', '2')],
+        ids=['serial', 'xdist']
+    )
+    def test_should_only_print_failures_and_tallies_when_quiet(
+        self,
+        testdir,
+        args
+    ):
+        if args:
+            pytest.importorskip('xdist')
+        testdir.makepyfile("""
+            import pytest
+
+            class TestGreen(object):
+                def test_foo(self):
+                    pass
+
+                def test_bar(self):
+                    pass
+
+            class TestMixed(object):
+                def test_foo(self):
+                    pass
+
+                def test_bar(self):
+                    assert False
+
+                @pytest.mark.skip
+                def test_baz(self):
+                    pass
+        """)
+
+        result = testdir.runpytest(
+            '--pspec',
+            '--pspec-quiet',
+            '--color=no',
+            *args
+        )
+
+        result.stdout.fnmatch_lines([
+            'Green',
+            ' 2 passed, 0 failed, 0 skipped',
+        ])
+        result.stdout.fnmatch_lines([
+            'Mixed',
+            ' ✗ bar',
+            ' 1 passed, 1 failed, 1 skipped',
+        ])
+        result.stdout.fnmatch_lines([' » baz'])
+        assert '✓' not in result.stdout.str()
+
+    def test_should_not_create_results_of_passed_specs_when_quiet(
+        self,
+        testdir
+    ):
+        testdir.makeini("""
+            [pytest]
+            pspec_format=failures
+        """)
+        testdir.makeconftest("""
+            import pytest
+
+            pytest_plugins = 'pytest_pspec.plugin'
+
+            @pytest.fixture(autouse=True)
+            def results(monkeypatch):
+                from pytest_pspec import models
+                create = models.Result.create
+                calls = []
+
+                def counting_create(report, *args):
+                    calls.append(report.nodeid)
+                    return create(report, *args)
+
+                monkeypatch.setattr(
+                    models.Result,
+                    'create',
+                    staticmethod(counting_create)
+                )
+                yield
+                assert calls == []
+        """)
+        testdir.makepyfile("""
+            def test_foo():
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec', '-p', 'no:cacheprovider')
+
+        result.assert_outcomes(passed=1)
+        assert '1 passed, 0 failed, 0 skipped' in result.stdout.str()
+
+    def test_should_stream_results_as_json_lines(self, testdir):
+        testdir.makepyfile("""
+            import pytest
+
+            class TestFoo(object):
+                def test_foo(self):
+                    pass
+
+            @pytest.mark.skip
+            def test_a_skipped_test():
+                pass
+        """)
+
+        testdir.runpytest('--pspec', '--pspec-jsonl', 'results.jsonl')
+
+        with open(str(testdir.tmpdir.join('results.jsonl'))) as f:
+            records = [json.loads(line) for line in f]
+
+        assert [record['nodeid'] for record in records] == [
+            'test_should_stream_results_as_json_lines.py::TestFoo::test_foo',
+            'test_should_stream_results_as_json_lines.py::test_a_skipped_test',
+        ]
+        assert records[0]['module'] == 'should stream results as json lines'
+        assert records[0]['class'] == 'Foo'
+        assert records[0]['title'] == 'foo'
+        assert records[0]['outcome'] == 'passed'
+        assert records[1]['outcome'] == 'skipped'
+        assert records[1]['duration'] >= 0
+
+    def test_should_write_json_lines_once_under_xdist(
+        self,
+        testdir,
+        monkeypatch
+    ):
+        pytest.importorskip('xdist')
+        import pytest_pspec
+
+        # The workers race the controller only in separate processes
+        monkeypatch.setenv(
+            'PYTHONPATH',
+            os.path.dirname(os.path.dirname(pytest_pspec.__file__))
+        )
+        testdir.makepyfile("""
+            import pytest
+
+            @pytest.mark.parametrize('value', range(200))
+            def test_foo(value):
+                pass
+        """)
+
+        testdir.runpytest_subprocess(
+            '--pspec',
+            '--pspec-jsonl', 'results.jsonl',
+            '-n', '2'
+        )
+
+        with open(str(testdir.tmpdir.join('results.jsonl'))) as f:
+            records = [json.loads(line) for line in f]
+
+        assert len(records) == 200
+        assert all(record['outcome'] == 'passed' for record in records)
+
+    def test_should_export_the_collected_names(self, testdir):
+        testdir.makepyfile("""
+            import pytest
+
+            class TestFoo(object):
+                @pytest.mark.parametrize('value', (1, 2))
+                def test_foo(self, value):
+                    pass
+
+            def test_bar():
+                'Bars'
+        """)
+
+        testdir.runpytest(
+            '--pspec',
+            '--collect-only',
+            '--pspec-export',
+            'inventory.json'
+        )
+
+        with open(str(testdir.tmpdir.join('inventory.json'))) as f:
+            columns = json.load(f)
+
+        strings = columns['strings']
+        assert columns['nodeids'][2] == \
+            'test_should_export_the_collected_names.py::test_bar'
+        assert [
+            (strings[module], strings[klass], strings[title])
+            for module, klass, title in zip(
+                columns['modules'],
+                columns['classes'],
+                columns['titles']
+            )
+        ] == [
+            ('should export the collected names', 'Foo', 'foo with value=1'),
+            ('should export the collected names', 'Foo', 'foo with value=2'),
+            ('should export the collected names', '', 'Bars'),
+        ]
+
+    def test_should_export_the_collected_names_under_xdist(self, testdir):
+        pytest.importorskip('xdist')
+        testdir.makepyfile("""
+            import pytest
+
+            @pytest.mark.parametrize('value', range(10))
+            def test_foo(value):
+                pass
+        """)
+
+        result = testdir.runpytest(
+            '--pspec',
+            '--pspec-export',
+            'inventory.json',
+            '-n',
+            '2'
+        )
+
+        with open(str(testdir.tmpdir.join('inventory.json'))) as f:
+            columns = json.load(f)
+
+        assert result.ret == 0
+        assert len(columns['nodeids']) == 10
+        assert columns['strings'][columns['titles'][3]] == 'foo with value=3'
+
+    def test_should_print_the_plugin_profile(self, testdir):
+        testdir.makepyfile("""
+            def test_a_feature_is_working():
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec', '--pspec-profile')
+
+        result.stdout.fnmatch_lines([
+            'pspec stage*calls*',
+            'display names*1*',
+            'stats registration*3*',
+            'model creation*1*',
+            'rendering*1*',
+            'writing*1*',
+        ])
+
+    def test_should_write_a_pstats_dump_and_restore_the_patches(
+        self,
+        testdir
+    ):
+        from pytest_pspec import models, reporter
+
+        display_nodeid = reporter._display_nodeid
+        format_title = models._format_title
+        testdir.makepyfile("""
+            def test_a_feature_is_working():
+                pass
+        """)
+
+        testdir.runpytest('--pspec', '--pspec-profile-dump', 'pspec.pstats')
+
+        stats = pstats.Stats(str(testdir.tmpdir.join('pspec.pstats')))
+        assert stats.total_calls > 0
+        assert reporter._display_nodeid is display_nodeid
+        assert models._format_title is format_title
+
+    @pytest.mark.parametrize(
+        'args',
+        [(), ('-n', '2')],
+        ids=['serial', 'xdist']
+    )
+    def test_should_keep_titles_containing_colons_whole(self, testdir, args):
+        if args:
+            pytest.importorskip('xdist')
+        testdir.makepyfile("""
+            import pytest
+
+            class TestFoo(object):
+                'Parses a::b'
+
+                @pytest.mark.parametrize('value', ['a::b'], ids=['a::b'])
+                def test_ids(self, value):
+                    pass
+
+                def test_docstring(self):
+                    'splits on :: once'
+        """)
+
+        result = testdir.runpytest('--pspec', '--color=no', *args)
+
+        # Under xdist the lines of a block come in the order tests finish
+        for line in (" ✓ ids with value='a::b'", ' ✓ splits on :: once'):
+            result.stdout.fnmatch_lines(['Parses a::b', line])
+
     def test_should_use_python_patterns_configuration(self, testdir):
         testdir.makeini("""
             [pytest]
@@ -228,3 +1007,326 @@ class TestReport(object):
 
         assert result.ret == ExitCode.INTERNAL_ERROR
         assert "INTERNALERROR> KeyError: 'missing_key'" in result.stdout.lines
+
+
+class TestLogreportExceptions(object):
+
+    @pytest.fixture
+    def reporter(self, testdir):
+        testdir.makeconftest("""
+            pytest_plugins = 'pytest_pspec.plugin'
+        """)
+        config = testdir.parseconfigure('--pspec')
+        return config.pluginmanager.getplugin('terminalreporter')
+
+    def count_raised(self, function, *args):
+        raised = []
+
+        def trace(frame, event, arg):
+            if event == 'exception':
+                raised.append(arg[0])
+            return trace
+
+        sys.settrace(trace)
+        try:
+            function(*args)
+        finally:
+            sys.settrace(None)
+        return raised
+
+    def make_report(self, index, when, outcome):
+        return reports.TestReport(
+            nodeid='test_module.py::TestFoo::test_foo_{}'.format(index),
+            location=(
+                'test_module.py', 0, 'TestFoo.test_foo_{}'.format(index)
+            ),
+            keywords={},
+            outcome=outcome,
+            longrepr=None if outcome != 'skipped'
+            else ('test_module.py', 0, 'Skipped'),
+            when=when
+        )
+
+    @pytest.mark.parametrize('when,outcome', (
+        ('setup', 'passed'),
+        ('call', 'passed'),
+        ('call', 'failed'),
+        ('setup', 'skipped'),
+        ('teardown', 'passed'),
+    ))
+    def test_should_not_raise_any_exception_per_report(
+        self,
+        reporter,
+        when,
+        outcome
+    ):
+        # Only warms up the header, every later title is a cache miss
+        reporter.pytest_runtest_logreport(self.make_report(0, when, outcome))
+
+        for index in range(1, 11):
+            assert self.count_raised(
+                reporter.pytest_runtest_logreport,
+                self.make_report(index, when, outcome)
+            ) == []
+
+
+class TestRegisterStats(object):
+
+    @pytest.fixture
+    def testdir(self, testdir):
+        testdir.makeconftest("""
+            pytest_plugins = 'pytest_pspec.plugin'
+        """)
+        return testdir
+
+    def make_report(self, when, outcome):
+        return reports.TestReport(
+            nodeid='test_module.py::test_foo',
+            location=('test_module.py', 0, 'test_foo'),
+            keywords={},
+            outcome=outcome,
+            longrepr=None if outcome != 'skipped'
+            else ('test_module.py', 0, 'Skipped'),
+            when=when
+        )
+
+    @pytest.mark.parametrize('when,outcome', (
+        ('setup', 'passed'),
+        ('setup', 'failed'),
+        ('setup', 'skipped'),
+        ('call', 'passed'),
+        ('call', 'failed'),
+        ('teardown', 'passed'),
+        ('teardown', 'failed'),
+    ))
+    def test_should_register_the_category_of_the_hook(
+        self,
+        testdir,
+        when,
+        outcome
+    ):
+        config = testdir.parseconfigure('--pspec')
+        reporter = config.pluginmanager.getplugin('terminalreporter')
+        report = self.make_report(when, outcome)
+
+        reporter._register_stats(report)
+
+        category = config.hook.pytest_report_teststatus(
+            report=report,
+            config=config
+        )[0]
+        assert reporter._fast_stats
+        assert reporter.stats[category] == [report]
+
+    def test_should_use_the_hook_of_another_plugin(self, testdir):
+        testdir.makepyfile(conftest="""
+            pytest_plugins = 'pytest_pspec.plugin'
+
+            def pytest_report_teststatus(report):
+                if report.when == 'setup':
+                    return 'set up', '', ''
+        """)
+        testdir.makepyfile("""
+            def test_foo():
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec')
+
+        result.stdout.fnmatch_lines(['*1 passed*1 set up*'])
+
+    def test_should_notice_a_hook_loaded_during_collection(self, testdir):
+        testdir.mkpydir('sub').join('conftest.py').write(
+            'def pytest_report_teststatus(report):\n'
+            '    if report.when == "teardown":\n'
+            '        return "torn down", "", ""\n'
+        )
+        testdir.makepyfile(**{'sub/test_foo': """
+            def test_foo():
+                pass
+        """})
+
+        result = testdir.runpytest('--pspec')
+
+        result.stdout.fnmatch_lines(['*1 passed*1 torn down*'])
+
+
+class TestLeanStats(object):
+
+    @pytest.fixture
+    def testdir(self, testdir):
+        testdir.makeconftest("""
+            pytest_plugins = 'pytest_pspec.plugin'
+        """)
+        return testdir
+
+    def test_should_print_the_same_summary(self, testdir):
+        testdir.makepyfile("""
+            import pytest
+
+            @pytest.fixture
+            def broken():
+                raise RuntimeError
+
+            @pytest.fixture
+            def noisy():
+                yield
+                print('tearing down noisily')
+
+            def test_passing():
+                pass
+
+            def test_failing(noisy):
+                assert False
+
+            @pytest.mark.skip
+            def test_skipped():
+                pass
+
+            @pytest.mark.xfail
+            def test_xfailed():
+                assert False
+
+            @pytest.mark.xfail
+            def test_xpassed():
+                pass
+
+            def test_erroring(broken):
+                pass
+        """)
+
+        full = testdir.runpytest('--pspec', '-rA')
+        lean = testdir.runpytest('--pspec', '-rA', '--pspec-lean-stats')
+
+        assert full.stdout.lines[-1].split(' in ')[0] == \
+            lean.stdout.lines[-1].split(' in ')[0]
+        assert 'tearing down noisily' in lean.stdout.str()
+        lean.assert_outcomes(
+            passed=1,
+            failed=1,
+            skipped=1,
+            xfailed=1,
+            xpassed=1,
+            errors=1
+        )
+
+    @pytest.mark.parametrize('options,max_growth', (
+        (('--pspec-lean-stats',), 16 * 1024),
+        ((), None),
+    ))
+    def test_should_not_grow_with_the_number_of_tests(
+        self,
+        testdir,
+        options,
+        max_growth
+    ):
+        import tracemalloc
+
+        import pytest_pspec
+        from pytest_pspec.reporter import PspecTerminalReporter
+
+        testdir.makeini("""
+            [pytest]
+            pspec_title_cache = false
+        """)
+        config = testdir.parseconfigure('--pspec', *options)
+        # Only what the plugin itself holds on to, not pytest's own plugins
+        plugin_only = [tracemalloc.Filter(
+            True,
+            os.path.join(os.path.dirname(pytest_pspec.__file__), '*')
+        )]
+
+        def run(reporter, start, stop):
+            for number in range(start, stop):
+                nodeid = 'test_module.py::TestFoo::test_{}'.format(number)
+                for when in ('setup', 'call', 'teardown'):
+                    reporter.pytest_runtest_logreport(reports.TestReport(
+                        nodeid=nodeid,
+                        location=('test_module.py', number, nodeid),
+                        keywords={},
+                        outcome='passed',
+                        longrepr=None,
+                        when=when,
+                        sections=[('Captured stdout call', 'x' * 1000)]
+                    ))
+
+        tracemalloc.start()
+        try:
+            with open(os.devnull, 'w') as devnull:
+                reporter = PspecTerminalReporter(config, devnull)
+                # Fills the bounded node cache first
+                run(reporter, 0, 2000)
+
+                before = tracemalloc.take_snapshot().filter_traces(plugin_only)
+                run(reporter, 2000, 5000)
+                after = tracemalloc.take_snapshot().filter_traces(plugin_only)
+        finally:
+            tracemalloc.stop()
+
+        growth = sum(
+            stat.size_diff for stat in after.compare_to(before, 'filename')
+        )
+        assert len(reporter._get_reports_to_display('passed')) == 5000
+        assert reporter.reported_progress == 5000
+        if max_growth is None:
+            assert growth > 64 * 1024
+        else:
+            assert growth < max_growth
+
+
+class TestLazyImport(object):
+
+    HEAVY_MODULES = (
+        'pytest_pspec.reporter',
+        'pytest_pspec.models',
+        'pytest_pspec.formatters',
+        'pytest_pspec.wrappers',
+        'six',
+    )
+
+    @pytest.fixture
+    def pythonpath(self, monkeypatch):
+        import pytest_pspec
+
+        root = os.path.dirname(os.path.dirname(pytest_pspec.__file__))
+        monkeypatch.setenv('PYTHONPATH', root)
+        return root
+
+    def test_should_import_only_the_entry_module(self, pythonpath):
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c',
+             'import pytest_pspec.plugin'],
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True
+        )
+
+        imported = set(
+            line.rsplit('|', 1)[-1].strip()
+            for line in process.stderr.splitlines()
+            if line.startswith('import time:')
+        )
+        assert 'pytest_pspec.plugin' in imported
+        assert imported.isdisjoint(self.HEAVY_MODULES)
+
+    def test_should_not_load_the_reporter_without_pspec(
+        self,
+        testdir,
+        pythonpath
+    ):
+        testdir.makeconftest("""
+            pytest_plugins = 'pytest_pspec.plugin'
+        """)
+        testdir.makepyfile("""
+            import sys
+
+            def test_reporter_is_not_loaded(request):
+                assert 'pytest_pspec.reporter' not in sys.modules
+                assert not request.config.pluginmanager.has_plugin(
+                    'pspec-reporter'
+                )
+        """)
+
+        result = testdir.runpytest_subprocess()
+
+        assert result.ret == ExitCode.OK
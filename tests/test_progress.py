@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import io
+import time
+
+from pytest_pspec.progress import ProgressFooter
+from pytest_pspec.writers import FooterFile
+
+
+class TestFooterFile(object):
+
+    def test_should_erase_the_footer_before_writing(self):
+        stream = io.StringIO()
+        footer_file = FooterFile(stream)
+
+        footer_file.write('first\n')
+        footer_file.draw('1/2')
+        footer_file.write('second\n')
+
+        assert stream.getvalue() == 'first\n\r\x1b[K1/2\r\x1b[Ksecond\n'
+
+    def test_should_not_draw_after_an_unfinished_line(self):
+        stream = io.StringIO()
+        footer_file = FooterFile(stream)
+
+        footer_file.write('test_module.py ')
+        footer_file.draw('1/2')
+
+        assert stream.getvalue() == 'test_module.py '
+
+    def test_should_leave_no_footer_behind_when_cleared(self):
+        stream = io.StringIO()
+        footer_file = FooterFile(stream)
+
+        footer_file.draw('1/2')
+        footer_file.clear()
+        footer_file.clear()
+
+        assert stream.getvalue() == '\r\x1b[K1/2\r\x1b[K'
+
+
+class TestProgressFooter(object):
+
+    def test_should_show_the_throughput_and_eta(self):
+        footer = ProgressFooter(FooterFile(io.StringIO()))
+        footer.total = 100
+
+        footer.line(10.0)
+        for number in range(20):
+            footer.start('test_{}'.format(number))
+            footer.finish('test_{}'.format(number))
+        footer.start('test_module.py::test_slow')
+        line = footer.line(12.0)
+        footer.stop()
+
+        assert line.startswith('20/100 | 10.0 tests/s | ETA 0:08 | ')
+        assert 'slowest: test_module.py::test_slow' in line
+
+    def test_should_fit_the_terminal_width(self):
+        footer = ProgressFooter(FooterFile(io.StringIO()), width=20)
+        footer._running['test_module.py::' + 'x' * 100] = 0.0
+
+        assert len(footer.line(1.0)) == 19
+
+    def test_should_redraw_on_a_timer(self):
+        stream = io.StringIO()
+        footer = ProgressFooter(FooterFile(stream), interval=0.01)
+
+        footer.start('test_module.py::test_foo')
+        time.sleep(0.1)
+        footer.finish('test_module.py::test_foo')
+        footer.stop()
+
+        output = stream.getvalue()
+        assert output.count('0/? | ') > 1
+        assert output.endswith('\r\x1b[K')
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import io
+import os
+import socket
+import subprocess
+import sys
+import time
+import types
+
+import pytest
+
+from pytest_pspec.server import ModuleSnapshot, _stream_output
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestModuleSnapshot(object):
+
+    @pytest.fixture
+    def module(self, tmp_path):
+        path = tmp_path / 'app.py'
+        path.write_text('X = 1\n')
+        module = types.ModuleType('app')
+        module.__file__ = str(path)
+        return module
+
+    def test_should_find_nothing_changed(self, module):
+        snapshot = ModuleSnapshot({'app': module})
+
+        assert len(snapshot) == 1
+        assert snapshot.changed() is None
+
+    def test_should_find_a_changed_module_file(self, module):
+        snapshot = ModuleSnapshot({'app': module})
+
+        with open(module.__file__, 'w') as f:
+            f.write('X = 22\n')
+
+        assert snapshot.changed() == module.__file__
+
+    def test_should_skip_modules_without_a_file(self):
+        snapshot = ModuleSnapshot({'builtin': types.ModuleType('builtin')})
+
+        assert len(snapshot) == 0
+
+
+class FakeConnection(object):
+
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+
+    def recv(self, size):
+        return self._chunks.pop(0) if self._chunks else b''
+
+
+class TestStreamOutput(object):
+
+    def test_should_hold_back_the_exit_code(self):
+        out = io.BytesIO()
+
+        code = _stream_output(FakeConnection([b'1 pass', b'ed\n\x02']), out)
+
+        assert out.getvalue() == b'1 passed\n'
+        assert code == 2
+
+    def test_should_fail_when_the_server_goes_away(self):
+        assert _stream_output(FakeConnection([]), io.BytesIO()) == 1
+
+
+@pytest.mark.skipif(
+    not hasattr(os, 'fork') or not hasattr(socket, 'AF_UNIX'),
+    reason='needs fork() and Unix sockets'
+)
+class TestForkServer(object):
+
+    @pytest.fixture
+    def env(self):
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            [ROOT, env['PYTHONPATH']] if env.get('PYTHONPATH') else [ROOT]
+        )
+        env['PSPEC_SOCKET'] = 'pspec.sock'
+        return env
+
+    @pytest.fixture
+    def server(self, testdir, env):
+        testdir.makeconftest("""
+            pytest_plugins = 'pytest_pspec.plugin'
+        """)
+        testdir.makepyfile(app="""
+            X = 1
+        """)
+        env['PYTHONPATH'] = os.pathsep.join(
+            [str(testdir.tmpdir), env['PYTHONPATH']]
+        )
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'pytest_pspec.server', 'serve', 'app'],
+            cwd=str(testdir.tmpdir),
+            env=env,
+            stderr=subprocess.DEVNULL
+        )
+        path = testdir.tmpdir.join('pspec.sock')
+        deadline = time.time() + 10
+        while not path.exists() and time.time() < deadline:
+            time.sleep(0.05)
+
+        yield process
+
+        process.terminate()
+        process.wait()
+
+    def run(self, testdir, env, *args):
+        return subprocess.run(
+            [sys.executable, os.path.join(ROOT, 'bin', 'pspec'), 'run'] +
+            list(args),
+            cwd=str(testdir.tmpdir),
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT
+        )
+
+    def test_should_stream_a_run_from_the_server(self, testdir, env, server):
+        testdir.makepyfile("""
+            import app
+
+            def test_a_feature_is_working():
+                assert app.X == 1
+        """)
+
+        result = self.run(testdir, env, '--color=no')
+
+        assert result.returncode == 0
+        assert '✓ a feature is working' in result.stdout.decode('utf-8')
+
+    def test_should_reload_changed_modules(self, testdir, env, server):
+        testdir.makepyfile("""
+            import app
+
+            def test_a_feature_is_working():
+                assert app.X == 1
+        """)
+        self.run(testdir, env)
+
+        testdir.makepyfile(app="""
+            X = 22
+        """)
+        result = self.run(testdir, env, '--color=no')
+
+        assert result.returncode == 1
+        assert '✗ a feature is working' in result.stdout.decode('utf-8')
+
+    def test_should_run_pytest_without_a_server(self, testdir, env):
+        testdir.makeconftest("""
+            pytest_plugins = 'pytest_pspec.plugin'
+        """)
+        testdir.makepyfile("""
+            def test_a_feature_is_working():
+                pass
+        """)
+
+        result = self.run(testdir, env, '--color=no')
+
+        assert result.returncode == 0
+        assert '✓ a feature is working' in result.stdout.decode('utf-8')
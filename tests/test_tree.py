@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import pytest
+
+from pytest_pspec.models import PatternConfig
+from pytest_pspec.tree import SpecTree
+
+
+class TestSpecTree(object):
+
+    @pytest.fixture
+    def pattern_config(self):
+        return PatternConfig(
+            files=['test_*.py'],
+            functions=['test*'],
+            classes=['Test*']
+        )
+
+    @pytest.fixture
+    def spec_tree(self, testdir, pattern_config):
+        items = testdir.getitems("""
+            def test_module_level():
+                pass
+
+            class TestOuter(object):
+                def test_foo(self):
+                    pass
+
+                class TestInner(object):
+                    '''Inner block'''
+
+                    def test_bar(self):
+                        pass
+
+                    def test_baz(self):
+                        pass
+        """)
+        return SpecTree.build(items, pattern_config)
+
+    def test_should_index_every_spec(self, spec_tree):
+        assert len(spec_tree) == 4
+
+    def test_should_share_the_node_of_a_block(self, spec_tree, testdir):
+        module = testdir.tmpdir.listdir('*.py')[0].basename
+
+        bar = spec_tree.header(module + '::TestOuter::TestInner::test_bar')
+        baz = spec_tree.header(module + '::TestOuter::TestInner::test_baz')
+
+        assert bar is baz
+        assert bar.title == 'Inner block'
+        assert bar.size == 2
+
+    def test_should_nest_classes(self, spec_tree, testdir):
+        module = testdir.tmpdir.listdir('*.py')[0].basename
+
+        inner = spec_tree.header(module + '::TestOuter::TestInner::test_bar')
+        outer = spec_tree.header(module + '::TestOuter::test_foo')
+
+        assert inner.parent is outer
+        assert [node.title for node in inner.path] == ['Outer', 'Inner block']
+        assert (outer.indent, inner.indent) == (0, 2)
+
+    def test_should_use_the_module_of_a_spec_without_class(
+        self,
+        spec_tree,
+        testdir
+    ):
+        module = testdir.tmpdir.listdir('*.py')[0].basename
+
+        node = spec_tree.header(module + '::test_module_level')
+
+        assert [block.title for block in node.path] == [node.title]
+        assert node.indent == 0
+
+    def test_should_not_know_other_nodeids(self, spec_tree):
+        assert spec_tree.header('test_other.py::test_foo') is None
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import pytest
+
+from pytest_pspec import wrappers
+from pytest_pspec.models import Node, Result
+
+
+class TestRenderer(object):
+
+    @pytest.mark.parametrize('outcome', ('passed', 'failed', 'skipped', 'x'))
+    @pytest.mark.parametrize('utf8,color', (
+        (True, True),
+        (True, False),
+        (False, True),
+        (False, False),
+    ))
+    def test_should_render_like_the_wrapper_chain(self, outcome, utf8, color):
+        result = Result(outcome, Node('a title', 'Class', 'module'))
+        wrapped = result
+        if utf8:
+            wrapped = wrappers.UTF8Wrapper(wrapped)
+        if color:
+            wrapped = wrappers.ColorWrapper(wrapped)
+
+        render = wrappers.Renderer(utf8=utf8, color=color)
+
+        assert render(result) == str(wrapped)
+
+    def test_should_not_reset_colors_of_unknown_outcomes(self):
+        result = Result('xpassed', Node('a title', 'Class', 'module'))
+
+        assert wrappers.Renderer()(result) == ' » a title'
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import io
+import threading
+
+import pytest
+
+from pytest_pspec.writers import AsyncFile
+
+
+class BlockedStream(io.StringIO):
+
+    def __init__(self):
+        super(BlockedStream, self).__init__()
+        self.released = threading.Event()
+
+    def write(self, msg):
+        self.released.wait()
+        return super(BlockedStream, self).write(msg)
+
+
+class TestAsyncFile(object):
+
+    def test_should_write_everything_in_order_once_drained(self):
+        stream = io.StringIO()
+        async_file = AsyncFile(stream, 10, batch=7)
+
+        for number in range(1000):
+            async_file.write('{}\n'.format(number))
+        async_file.drain()
+
+        expected = ''.join('{}\n'.format(number) for number in range(1000))
+        assert stream.getvalue() == expected
+        async_file.close()
+
+    def test_should_block_writers_while_the_queue_is_full(self):
+        stream = BlockedStream()
+        async_file = AsyncFile(stream, 2, batch=1)
+        writer = threading.Thread(
+            target=lambda: [async_file.write('x') for _ in range(5)]
+        )
+
+        writer.start()
+        writer.join(0.1)
+        blocked = writer.is_alive()
+        stream.released.set()
+        writer.join()
+        async_file.close()
+
+        assert blocked
+        assert stream.getvalue() == 'xxxxx'
+
+    def test_should_raise_write_errors_on_drain(self):
+        stream = io.StringIO()
+        stream.close()
+        async_file = AsyncFile(stream, 10)
+
+        async_file.write('lost\n')
+
+        with pytest.raises(ValueError):
+            async_file.drain()
+        async_file.close()
+
+    def test_should_write_directly_once_closed(self):
+        stream = io.StringIO()
+        async_file = AsyncFile(stream, 10)
+
+        async_file.write('queued\n')
+        async_file.close()
+        async_file.write('direct\n')
+
+        assert stream.getvalue() == 'queued\ndirect\n'